@@ -0,0 +1,66 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import json
+import time
+from urlparse import urljoin
+from httplib import HTTPConnection
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cronicle import CronicleAPI
+from bench.server import StandInServer
+
+def open_sockets():
+    count = 0
+    for fd in os.listdir("/proc/self/fd"):
+        try:
+            if os.readlink("/proc/self/fd/%s" % fd).startswith("socket:"):
+                count += 1
+        except OSError:
+            pass
+    return count
+
+class UnpooledAPI(CronicleAPI):
+    # The behaviour of call_api before connections were pooled: a new
+    # connection per call that is never explicitly closed.
+    def call_api(self, name, params):
+        url = urljoin(self.url, "app/%s/v1" % name)
+        params["api_key"] = self.key
+        connection = HTTPConnection(self.host)
+        connection.request("POST", url, json.dumps(params), { "Content-Type": "application/json" })
+        response = connection.getresponse()
+        self.connections.append(connection)
+        return json.loads(response.read())
+
+def measure(api, server, calls):
+    sockets = open_sockets()
+    connections = server.connections
+    start = time.time()
+    for i in xrange(calls):
+        api.call_api("get_job_status", { "id": "job%d" % i })
+    elapsed = time.time() - start
+    return {
+        "calls_per_sec": calls / elapsed,
+        "open_sockets": open_sockets() - sockets,
+        "connections": server.connections - connections,
+    }
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    server = StandInServer()
+
+    unpooled = UnpooledAPI(server.url, "key")
+    unpooled.connections = []
+    before = measure(unpooled, server, calls)
+
+    pooled = CronicleAPI(server.url, "key")
+    after = measure(pooled, server, calls)
+
+    print("%-10s %12s %14s %12s" % ("", "calls/sec", "open sockets", "connections"))
+    for name, result in [("before", before), ("after", after)]:
+        print("%-10s %12.1f %14d %12d" % (name, result["calls_per_sec"], result["open_sockets"], result["connections"]))
+
+if __name__ == "__main__":
+    main()
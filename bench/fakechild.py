@@ -0,0 +1,32 @@
+#! /usr/bin/env python
+
+import os
+import sys
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.loggen import generate, parse_mix
+
+def main():
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("--command", default="backup")
+    parser.add_option("--lines", type="int", default=100000)
+    parser.add_option("--mix", default=None)
+    parser.add_option("--seed", type="int", default=1)
+    options, args = parser.parse_args()
+
+    mix = parse_mix(options.mix) if options.mix else None
+    batch = []
+    for line in generate(options.command, options.lines, mix, options.seed):
+        batch.append(line)
+        if len(batch) == 1000:
+            batch.append("")
+            sys.stdout.write("\n".join(batch))
+            batch = []
+    batch.append("")
+    sys.stdout.write("\n".join(batch))
+    sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import json
+import time
+import heapq
+import random
+import threading
+from Queue import Queue
+from urlparse import urlparse
+from optparse import OptionParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cronicle import CronicleAPI, CronicleError
+from cronicle.connection import ConnectionPool
+from cronicle.futures import wait_all, TimeoutError
+from cronicle.perf import percentile
+from bench.server import StandInServer
+
+class FakeMaster(StandInServer):
+    # Jobs on multiplexed events run on this many servers at once.
+    targets = 3
+
+    def __init__(self, latency = 0, failure_rate = 0, launch_failure_rate = 0, job_failure_rate = 0,
+                 duration = 1.0, jitter = 0.5, start_delay = 0, events = 50, senders = 16):
+        self.launch_failure_rate = launch_failure_rate
+        self.job_failure_rate = job_failure_rate
+        self.duration = duration
+        self.jitter = jitter
+        self.start_delay = start_delay
+
+        self.events = {}
+        for i in range(events):
+            event = { "id": "e%d" % i, "title": "Event %d" % i, "enabled": 1, "multiplex": 0 }
+            self.events[event["id"]] = event
+        multiplex = { "id": "multiplex", "title": "Multiplex", "enabled": 1, "multiplex": 1 }
+        self.events[multiplex["id"]] = multiplex
+
+        self.jobs = {}
+        self.next_id = 0
+        self.timers = []
+        self.timer_lock = threading.Lock()
+        self.pools = {}
+        self.pool_lock = threading.Lock()
+        self.hooks = Queue()
+        self.counters = { "launched": 0, "hooks_sent": 0, "hook_errors": 0 }
+
+        StandInServer.__init__(self, latency, failure_rate)
+
+        self.start_thread(self.run_timers)
+        for i in range(senders):
+            self.start_thread(self.send_hooks)
+
+    def start_thread(self, target):
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def find_event(self, params):
+        if "id" in params:
+            return self.events.get(params["id"])
+        for event in self.events.values():
+            if event["title"] == params.get("title"):
+                return event
+        return None
+
+    def handle_api(self, name, params):
+        if name == "get_schedule":
+            rows = self.events.values()
+            return { "code": 0, "rows": rows, "list": { "length": len(rows) } }
+        if name == "get_event":
+            event = self.find_event(params)
+            if event is None:
+                return { "code": "event", "description": "Event not found." }
+            return { "code": 0, "event": event }
+        if name == "run_event":
+            return self.run_event(params)
+        if name == "get_job_status":
+            with self.lock:
+                job = self.jobs.get(params["id"])
+                if job is None:
+                    return { "code": "job", "description": "Job not found." }
+                return { "code": 0, "job": self.job_status(job, time.time()) }
+        if name == "get_active_jobs":
+            now = time.time()
+            with self.lock:
+                active = dict((id, self.job_status(job, now)) for (id, job) in self.jobs.items()
+                              if job["started"] is not None and job["completed"] is None)
+            return { "code": 0, "jobs": active }
+        return { "code": 0 }
+
+    def run_event(self, params):
+        event = self.find_event(params)
+        if event is None:
+            return { "code": "event", "description": "Event not found." }
+
+        now = time.time()
+        count = self.targets if event["multiplex"] else 1
+        # A launch failure means no job ever starts, which Cronicle only
+        # reports for events that run on a single server.
+        failed = not event["multiplex"] and random.random() < self.launch_failure_rate
+
+        ids = []
+        with self.lock:
+            self.counters["launched"] += count
+            for i in range(count):
+                self.next_id += 1
+                id = "j%d" % self.next_id
+                duration = self.duration * random.uniform(1 - self.jitter, 1 + self.jitter)
+                self.jobs[id] = {
+                    "id": id,
+                    "event": event,
+                    "web_hook": params.get("web_hook"),
+                    "launched": now,
+                    "start": now + self.start_delay,
+                    "end": now + self.start_delay + duration,
+                    "code": 1 if random.random() < self.job_failure_rate else 0,
+                    "started": None,
+                    "completed": None,
+                }
+                ids.append(id)
+
+        for id in ids:
+            job = self.jobs[id]
+            if failed:
+                self.schedule(job["start"], "job_launch_failure", job)
+            else:
+                self.schedule(job["start"], "job_start", job)
+                self.schedule(job["end"], "job_complete", job)
+        return { "code": 0, "ids": ids }
+
+    def job_status(self, job, now):
+        status = {
+            "id": job["id"],
+            "event": job["event"]["id"],
+            "event_title": job["event"]["title"],
+            "hostname": "fakemaster",
+            "job_details_url": "%s#JobDetails?id=%s" % (self.url, job["id"]),
+        }
+        if job["completed"] is not None:
+            status["complete"] = 1
+            status["code"] = job["code"]
+            status["description"] = "Job failed." if job["code"] != 0 else "Success"
+            status["elapsed"] = job["end"] - job["start"]
+        else:
+            total = job["end"] - job["start"]
+            status["progress"] = min(max((now - job["start"]) / total, 0.0), 1.0) if total > 0 else 0.0
+            status["elapsed"] = max(now - job["start"], 0)
+        return status
+
+    def schedule(self, when, action, job):
+        with self.timer_lock:
+            heapq.heappush(self.timers, (when, action, job["id"]))
+
+    def run_timers(self):
+        while True:
+            now = time.time()
+            due = []
+            with self.timer_lock:
+                while len(self.timers) > 0 and self.timers[0][0] <= now:
+                    due.append(heapq.heappop(self.timers))
+
+            for when, action, id in due:
+                with self.lock:
+                    job = self.jobs[id]
+                    if action == "job_start":
+                        job["started"] = now
+                    elif action == "job_complete":
+                        job["completed"] = now
+                    data = self.job_status(job, now)
+                data["action"] = action
+                self.hooks.put((job["web_hook"], data))
+
+            if len(due) == 0:
+                time.sleep(0.002)
+
+    def get_pool(self, host):
+        with self.pool_lock:
+            if host not in self.pools:
+                self.pools[host] = ConnectionPool(host, max_idle = 16, connect_timeout = 10, read_timeout = 10)
+            return self.pools[host]
+
+    def send_hooks(self):
+        while True:
+            url, data = self.hooks.get()
+            if url is None:
+                continue
+
+            parts = urlparse(url)
+            try:
+                status, reason, body = self.get_pool(parts[1]).request("POST", parts[2], json.dumps(data),
+                                                                       { "Content-Type": "application/json" })
+                counter = "hooks_sent" if status == 200 else "hook_errors"
+            except Exception:
+                counter = "hook_errors"
+            with self.lock:
+                self.counters[counter] += 1
+
+def summarize(name, values):
+    if len(values) == 0:
+        return "%-22s %8s" % (name, "-")
+    values = [value * 1000 for value in values]
+    return "%-22s %8d %10.1f %10.1f %10.1f %10.1f" % (name, len(values), percentile(values, 0.5),
+                                                     percentile(values, 0.9), percentile(values, 0.99), max(values))
+
+def run_jobs(master, options):
+    api = CronicleAPI(master.url, "key")
+    if options.multiplex:
+        event = api.get_event(id = "multiplex")
+    else:
+        event = api.get_event(id = "e0")
+
+    launches = Queue()
+    for i in xrange(options.jobs):
+        launches.put(i)
+
+    queued_jobs = []
+    started = {}
+    completed = {}
+    errors = []
+    lock = threading.Lock()
+
+    def watch(queued_job, launched):
+        def on_start(future):
+            now = time.time()
+            if future.exception() is not None:
+                return
+            for job in queued_job.jobs:
+                with lock:
+                    started[job.id] = now - launched
+                job.complete_future.add_done_callback(lambda future: on_complete(future.result()))
+        def on_complete(job):
+            with lock:
+                completed[job.id] = time.time()
+        queued_job.job_future.add_done_callback(on_start)
+
+    def launch():
+        while not launches.empty():
+            try:
+                launches.get_nowait()
+            except Exception:
+                return
+            launched = time.time()
+            try:
+                queued_job = event.run()
+            except CronicleError as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            watch(queued_job, launched)
+            with lock:
+                queued_jobs.append(queued_job)
+
+    start = time.time()
+    threads = [threading.Thread(target=launch) for i in range(options.launchers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    launch_time = time.time() - start
+
+    timeout = options.start_delay + options.duration * (1 + options.jitter) + options.timeout
+    unfinished = 0
+    try:
+        wait_all([queued_job.job_future for queued_job in queued_jobs], timeout)
+    except TimeoutError as e:
+        print("Not all jobs started: %s" % str(e))
+    except CronicleError:
+        pass
+
+    futures = [job.complete_future for queued_job in queued_jobs for job in queued_job.jobs]
+    try:
+        wait_all(futures, timeout)
+    except TimeoutError as e:
+        print("Not all jobs completed: %s" % str(e))
+    elapsed = time.time() - start
+    api.close()
+
+    # The master timestamps when each job actually finished, so the
+    # difference is the time it took the client to learn about it.
+    with master.lock:
+        notify = [completed[id] - job["completed"] for (id, job) in master.jobs.items()
+                  if id in completed and job["completed"] is not None]
+        launch_failures = len([queued_job for queued_job in queued_jobs if queued_job.job_future.exception() is not None])
+        counters = dict(master.counters)
+
+    print("jobs launched:   %d in %.1fs (%.0f/sec)" % (counters["launched"], launch_time, counters["launched"] / launch_time))
+    print("launch errors:   %d" % len(errors))
+    print("launch failures: %d" % launch_failures)
+    print("jobs completed:  %d in %.1fs" % (len(completed), elapsed))
+    print("hooks sent:      %d (%d errors)" % (counters["hooks_sent"], counters["hook_errors"]))
+    print("")
+    print("%-22s %8s %10s %10s %10s %10s" % ("latency (ms)", "count", "p50", "p90", "p99", "max"))
+    print(summarize("launch-to-start", [value - options.start_delay for value in started.values()]))
+    print(summarize("complete-to-notify", notify))
+
+def run_sequence(master, options):
+    from sequence import SequencePlugin
+
+    titles = ["Event %d" % i for i in range(options.steps)]
+    params = {
+        "api_host": master.url,
+        "api_key": "key",
+        "events": "\n".join(titles),
+    }
+    if options.graph:
+        # Every step after the first depends only on the first.
+        params["graph"] = 1
+        params["events"] = "\n".join([titles[0]] + ["%s <- %s" % (title, titles[0]) for title in titles[1:]])
+
+    plugin = SequencePlugin(start = False, stdout = open(os.devnull, "w"))
+    start = time.time()
+    try:
+        plugin.execute(params)
+    except CronicleError as e:
+        print("Sequence failed: %s" % str(e))
+    elapsed = time.time() - start
+    plugin.output.close()
+
+    with master.lock:
+        busy = [job["end"] - job["launched"] for job in master.jobs.values()]
+    critical = max(busy) * 2 if options.graph else sum(busy)
+    print("steps:    %d" % len(busy))
+    print("elapsed:  %.2fs" % elapsed)
+    print("overhead: %.2fs over the %.2fs the jobs themselves needed" % (elapsed - critical, critical))
+
+def main():
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("--jobs", type="int", default=2000)
+    parser.add_option("--launchers", type="int", default=16, help="threads calling run_event")
+    parser.add_option("--multiplex", action="store_true", default=False, help="launch a multiplexed event")
+    parser.add_option("--sequence", action="store_true", default=False, help="run SequencePlugin instead")
+    parser.add_option("--steps", type="int", default=10, help="events in the sequence")
+    parser.add_option("--graph", action="store_true", default=False, help="run the sequence as a fan-out graph")
+    parser.add_option("--latency", type="float", default=0, help="seconds added to every API call")
+    parser.add_option("--failure-rate", type="float", default=0, help="fraction of API calls that return 500")
+    parser.add_option("--launch-failure-rate", type="float", default=0)
+    parser.add_option("--job-failure-rate", type="float", default=0)
+    parser.add_option("--duration", type="float", default=5.0, help="mean job duration in seconds")
+    parser.add_option("--jitter", type="float", default=0.5, help="job durations vary by this fraction")
+    parser.add_option("--start-delay", type="float", default=0, help="seconds between launch and job_start")
+    parser.add_option("--timeout", type="float", default=60, help="extra seconds to wait for stragglers")
+    options, args = parser.parse_args()
+
+    master = FakeMaster(latency = options.latency,
+                        failure_rate = options.failure_rate,
+                        launch_failure_rate = options.launch_failure_rate,
+                        job_failure_rate = options.job_failure_rate,
+                        duration = options.duration,
+                        jitter = options.jitter,
+                        start_delay = options.start_delay,
+                        events = max(options.steps, 50))
+
+    if options.sequence:
+        run_sequence(master, options)
+    else:
+        run_jobs(master, options)
+
+if __name__ == "__main__":
+    main()
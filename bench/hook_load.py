@@ -0,0 +1,98 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+from httplib import HTTPConnection
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cronicle import CronicleAPI
+from cronicle.event import CronicleEvent
+from cronicle.job import CronicleQueuedJob
+from cronicle.hookmanager import HookManager, Hook
+from bench.server import StandInServer
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent))]
+
+def send_callbacks(port, hook_ids, latencies, lock):
+    connection = HTTPConnection("127.0.0.1", port)
+    results = []
+    for hook_id in hook_ids:
+        for action in ["job_start", "job_complete"]:
+            body = json.dumps({ "action": action, "id": "job-%s" % hook_id, "job_details_url": "" })
+            start = time.time()
+            connection.request("POST", "/%s" % hook_id, body, { "Content-Type": "application/json" })
+            connection.getresponse().read()
+            results.append(time.time() - start)
+    connection.close()
+    with lock:
+        latencies.extend(results)
+
+def open_stalled(port, idle, slow):
+    # Idle clients connect and never send anything, slow ones stall halfway
+    # through a request. Neither should delay the real callbacks.
+    sockets = []
+    for i in xrange(idle + slow):
+        sock = socket.create_connection(("127.0.0.1", port))
+        if i >= idle:
+            sock.sendall("POST /slow HTTP/1.1\r\nContent-")
+        sockets.append(sock)
+    return sockets
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    jobs_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    idle = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    slow = int(sys.argv[4]) if len(sys.argv) > 4 else 8
+
+    server = StandInServer()
+    api = CronicleAPI(server.url, "key")
+    manager = HookManager(api)
+    event = CronicleEvent(api, { "id": "event", "title": "Event", "multiplex": 0 })
+
+    queued_jobs = []
+    hook_ids = []
+    for i in xrange(clients * jobs_per_client):
+        queued_job = CronicleQueuedJob(api, event)
+        hook_id = manager.create_hook_id()
+        manager.hooks[hook_id] = Hook(api, event, queued_job)
+        queued_jobs.append(queued_job)
+        hook_ids.append(hook_id)
+
+    stalled = open_stalled(manager.server.server_port, idle, slow)
+
+    latencies = []
+    lock = threading.Lock()
+    threads = []
+    start = time.time()
+    for i in xrange(clients):
+        ids = hook_ids[i * jobs_per_client:(i + 1) * jobs_per_client]
+        thread = threading.Thread(target=send_callbacks, args=(manager.server.server_port, ids, latencies, lock))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+    # Responses are sent before dispatch, wait for the hooks to drain.
+    while len(manager.hooks) > 0 and time.time() - start < 60:
+        time.sleep(0.01)
+    elapsed = time.time() - start
+    for sock in stalled:
+        sock.close()
+
+    completed = len([q for q in queued_jobs if q.job is not None and q.job.hook_complete_data is not None])
+    print("stalled:       %d idle, %d slow" % (idle, slow))
+    print("callbacks:     %d" % len(latencies))
+    print("completed:     %d/%d" % (completed, len(queued_jobs)))
+    print("callbacks/sec: %.1f" % (len(latencies) / elapsed))
+    print("latency p50:   %.2fms" % (percentile(latencies, 0.5) * 1000))
+    print("latency p99:   %.2fms" % (percentile(latencies, 0.99) * 1000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import random
+
+default_mix = {
+    "debug": 0.6,
+    "progress": 0.3,
+    "info": 0.1,
+}
+
+progress_types = {
+    "backup": "UPLOAD_PROGRESS",
+    "copy": "SNAPSHOT_COPY",
+    "check": "SNAPSHOT_VERIFY",
+}
+
+def timestamp(i):
+    seconds = i // 1000
+    return "2020-01-01 %02d:%02d:%02d.%03d" % ((seconds // 3600) % 24, (seconds // 60) % 60, seconds % 60, i % 1000)
+
+def progress_line(command, i, lines):
+    if command == "backup":
+        return ("Uploaded chunk %d size 4194304, 12.34MB/s 00:01:23 %.1f%%" %
+                (i, 100.0 * i / lines))
+    if command == "copy":
+        return "Copied chunk %08x (%d/%d)" % (i, i, lines)
+    return "Verified chunk %08x (%d/%d)" % (i, i, lines)
+
+def header(command):
+    if command == "backup":
+        return ["INFO REPOSITORY_SET Repository set to /data",
+                "INFO BACKUP_START Last backup at revision 12 found"]
+    if command == "check":
+        return ["INFO SNAPSHOT_CHECK 1 snapshots and 1 revisions"]
+    return ["INFO SNAPSHOT_COPY Copying snapshot data"]
+
+def footer(command):
+    if command != "backup":
+        return []
+    return ["INFO BACKUP_STATS New files: 1204 total, 2,341K bytes",
+            "INFO BACKUP_STATS Changed files: 33 total, 1,022K bytes",
+            "INFO BACKUP_STATS Unchanged files: 88120 total, 120,404M bytes",
+            "INFO BACKUP_STATS Removed files: 4 total, 12K bytes",
+            "INFO BACKUP_STATS File chunks: 24011 total, 120,407M bytes; 331 new, 3,363K bytes, 1,912K bytes uploaded",
+            "INFO BACKUP_STATS Metadata chunks: 5 total, 22,124K bytes; 5 new, 22,124K bytes, 8,231K bytes uploaded",
+            "INFO BACKUP_END Backup for /data at revision 13 completed"]
+
+def generate(command = "backup", lines = 100000, mix = None, seed = 1):
+    mix = mix or default_mix
+    total = float(sum(mix.values()))
+    debug = mix.get("debug", 0) / total
+    progress = debug + mix.get("progress", 0) / total
+
+    rand = random.Random(seed)
+    count = 0
+    for line in header(command):
+        yield "%s %s" % (timestamp(count), line)
+        count += 1
+
+    for i in xrange(lines):
+        value = rand.random()
+        if value < debug:
+            line = "DEBUG CHUNK_CACHE Chunk %016x has been loaded from the snapshot cache" % rand.getrandbits(64)
+        elif value < progress:
+            line = "INFO %s %s" % (progress_types[command], progress_line(command, i, lines))
+        else:
+            line = "INFO UPLOAD_FILE Uploaded file data/dir%d/file%d.bin" % (i % 97, i)
+        yield "%s %s" % (timestamp(count), line)
+        count += 1
+
+    for line in footer(command):
+        yield "%s %s" % (timestamp(count), line)
+        count += 1
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, value = part.split("=")
+        mix[name.strip()] = float(value)
+    return mix
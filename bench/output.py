@@ -0,0 +1,49 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import time
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cronicle.output import OutputChannel
+
+LINE = "2020-01-01 12:00:00.000 INFO UPLOAD_FILE Uploaded file some/path/to/a/file.txt"
+
+def sink():
+    return subprocess.Popen(["cat"], stdin=subprocess.PIPE, stdout=open(os.devnull, "w"))
+
+def measure_unbuffered(lines):
+    process = sink()
+    start = time.time()
+    for i in xrange(lines):
+        process.stdin.write("%s\n" % LINE)
+        process.stdin.flush()
+    elapsed = time.time() - start
+    process.stdin.close()
+    process.wait()
+    return lines / elapsed
+
+def measure_channel(lines, batch_size):
+    process = sink()
+    channel = OutputChannel(process.stdin, batch_size, 0.5)
+    start = time.time()
+    for i in xrange(lines):
+        channel.write(LINE)
+    channel.close()
+    elapsed = time.time() - start
+    process.stdin.close()
+    process.wait()
+    return lines / elapsed
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    print("%-16s %14s" % ("batch size", "lines/sec"))
+    print("%-16s %14.0f" % ("unbuffered", measure_unbuffered(lines)))
+    for batch_size in [1024, 16384, 65536, 1048576]:
+        print("%-16d %14.0f" % (batch_size, measure_channel(lines, batch_size)))
+
+if __name__ == "__main__":
+    main()
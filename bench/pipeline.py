@@ -0,0 +1,103 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import json
+import time
+import resource
+import subprocess
+from optparse import OptionParser, SUPPRESS_HELP
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from duplicacy import DuplicacyPlugin, command_parsers
+
+class CountingStream:
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+        self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+def run_case(command, lines, mix):
+    stdout = CountingStream(open(os.devnull, "w"))
+    plugin = DuplicacyPlugin(start = False, stdout = stdout)
+    args = [sys.executable, os.path.join(ROOT, "bench", "fakechild.py"),
+            "--command", command, "--lines", str(lines)]
+    if mix:
+        args.extend(["--mix", mix])
+
+    start = time.time()
+    plugin.exec_process(args, command_parsers[command](plugin))
+    plugin.progress_emitter.flush()
+    plugin.output.close()
+    elapsed = time.time() - start
+
+    return {
+        "lines_per_sec": lines / elapsed,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "stdout_bytes": stdout.bytes,
+    }
+
+def run_isolated(command, lines, mix):
+    # Each case runs in its own interpreter so peak RSS is not shared.
+    args = [sys.executable, os.path.abspath(__file__), "--case", command, "--lines", str(lines)]
+    if mix:
+        args.extend(["--mix", mix])
+    output = subprocess.check_output(args)
+    return json.loads(output.strip().split("\n")[-1])
+
+def compare(results, baseline):
+    print("%-24s %14s %14s %9s" % ("case", "lines/sec", "baseline", "change"))
+    for name in sorted(results):
+        current = results[name]["lines_per_sec"]
+        if name in baseline:
+            previous = baseline[name]["lines_per_sec"]
+            print("%-24s %14.0f %14.0f %+8.1f%%" % (name, current, previous, 100.0 * (current - previous) / previous))
+        else:
+            print("%-24s %14.0f %14s %9s" % (name, current, "-", "-"))
+
+def report(results):
+    print("%-24s %14s %14s %14s" % ("case", "lines/sec", "peak RSS KB", "stdout bytes"))
+    for name in sorted(results):
+        result = results[name]
+        print("%-24s %14.0f %14d %14d" % (name, result["lines_per_sec"], result["peak_rss_kb"], result["stdout_bytes"]))
+
+def main():
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("--lines", type="int", default=200000)
+    parser.add_option("--mix", default=None)
+    parser.add_option("--commands", default="backup,copy,check")
+    parser.add_option("--save", default=None, help="save the results as a baseline file")
+    parser.add_option("--compare", default=None, help="compare the results against a baseline file")
+    parser.add_option("--case", default=None, help=SUPPRESS_HELP)
+    options, args = parser.parse_args()
+
+    if options.case is not None:
+        print(json.dumps(run_case(options.case, options.lines, options.mix)))
+        return
+
+    results = {}
+    for command in options.commands.split(","):
+        name = "duplicacy.%s" % command_parsers[command].__name__
+        results[name] = run_isolated(command, options.lines, options.mix)
+
+    report(results)
+
+    if options.compare is not None:
+        with open(options.compare) as file:
+            print("")
+            compare(results, json.load(file))
+
+    if options.save is not None:
+        with open(options.save, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
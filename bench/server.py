@@ -0,0 +1,71 @@
+import json
+import time
+import random
+import threading
+from SocketServer import ThreadingMixIn
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_request(self, code='-', size='-'):
+        pass
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.on_connection()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        params = json.loads(self.rfile.read(length))
+        name = self.path.strip("/").split("/")[-2]
+
+        if self.server.latency > 0:
+            time.sleep(self.server.latency)
+
+        if random.random() < self.server.failure_rate:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        result = self.server.handle_api(name, params)
+        body = json.dumps(result)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency = 0, failure_rate = 0):
+        HTTPServer.__init__(self, ("127.0.0.1", 0), StandInRequestHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.connections = 0
+        self.lock = threading.Lock()
+
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d/" % self.server_port
+
+    def on_connection(self):
+        with self.lock:
+            self.connections += 1
+
+    def handle_api(self, name, params):
+        if name == "get_job_status":
+            return { "code": 0, "job": { "id": params["id"], "progress": 0.5 } }
+        if name == "get_schedule":
+            rows = [{ "id": "e%d" % i, "title": "Event %d" % i, "enabled": 1 } for i in range(50)]
+            return { "code": 0, "rows": rows, "list": { "length": len(rows) } }
+        if name == "get_event":
+            return { "code": 0, "event": { "id": params.get("id", "e1"), "title": params.get("title", "Event") } }
+        return { "code": 0 }
@@ -0,0 +1,79 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import json
+import subprocess
+from optparse import OptionParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+entry_points = ["duplicacy", "speedtest", "sequence"]
+
+# Run in a fresh interpreter per sample, the same way Cronicle starts a job.
+probe = """
+import sys, time, json
+start = time.time()
+import %s
+elapsed = time.time() - start
+print(json.dumps({ "elapsed": elapsed, "modules": len(sys.modules),
+                   "httplib": "httplib" in sys.modules }))
+"""
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def run_probe(module):
+    output = subprocess.check_output([sys.executable, "-c", probe % module], cwd = ROOT)
+    return json.loads(output.strip().split("\n")[-1])
+
+def measure(module, runs):
+    samples = [run_probe(module) for i in range(runs)]
+    return {
+        "import_ms": 1000 * median([sample["elapsed"] for sample in samples]),
+        "modules": samples[-1]["modules"],
+        "httplib": samples[-1]["httplib"],
+    }
+
+def compare(results, baseline):
+    print("%-16s %12s %12s %9s" % ("entry point", "import ms", "baseline", "change"))
+    for name in sorted(results):
+        current = results[name]["import_ms"]
+        if name in baseline:
+            previous = baseline[name]["import_ms"]
+            print("%-16s %12.1f %12.1f %+8.1f%%" % (name, current, previous, 100.0 * (current - previous) / previous))
+        else:
+            print("%-16s %12.1f %12s %9s" % (name, current, "-", "-"))
+
+def report(results):
+    print("%-16s %12s %12s %12s" % ("entry point", "import ms", "modules", "httplib"))
+    for name in sorted(results):
+        result = results[name]
+        print("%-16s %12.1f %12d %12s" % (name, result["import_ms"], result["modules"], "yes" if result["httplib"] else "no"))
+
+def main():
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("--runs", type="int", default=20)
+    parser.add_option("--entry-points", default=",".join(entry_points))
+    parser.add_option("--save", default=None, help="save the results as a baseline file")
+    parser.add_option("--compare", default=None, help="compare the results against a baseline file")
+    options, args = parser.parse_args()
+
+    results = {}
+    for module in options.entry_points.split(","):
+        results[module] = measure(module, options.runs)
+
+    report(results)
+
+    if options.compare is not None:
+        with open(options.compare) as file:
+            print("")
+            compare(results, json.load(file))
+
+    if options.save is not None:
+        with open(options.save, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,32 @@
+import sys
+from types import ModuleType
 from .error import CronicleError
-from .api import CronicleAPI
-from .plugin import CroniclePlugin
+
+# Each job runs in a fresh interpreter, so the API client and its HTTP
+# dependencies are only imported once something actually uses them.
+lazy_attributes = {
+    "CronicleAPI": "api",
+    "CroniclePlugin": "plugin",
+}
+
+__all__ = ["CronicleError"] + sorted(lazy_attributes)
+
+class LazyModule(ModuleType):
+    def __getattr__(self, name):
+        if name not in lazy_attributes:
+            raise AttributeError("'module' object has no attribute '%s'" % name)
+
+        module = __import__("%s.%s" % (self.__name__, lazy_attributes[name]), fromlist = [name])
+        value = getattr(module, name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(lazy_attributes))
+
+module = LazyModule(__name__)
+module.__dict__.update(sys.modules[__name__].__dict__)
+# Python 2 clears a module's globals when it is freed, which would break the
+# functions above, so the replaced module is kept alive.
+module.original = sys.modules[__name__]
+sys.modules[__name__] = module
@@ -0,0 +1,313 @@
+import sys
+import json
+import time
+import socket
+import asyncore
+import asynchat
+from uuid import uuid4
+from StringIO import StringIO
+from urlparse import urlparse, urljoin
+from httplib import HTTPResponse, HTTPException
+from .error import CronicleError
+from .event import CronicleEvent
+from .futures import Future
+from .perf import recorder
+from .api import parse_result
+from .job import CronicleJob
+from .hookmanager import Hook
+
+class BufferSocket:
+    def __init__(self, data):
+        self.data = data
+
+    def makefile(self, *args):
+        return StringIO(self.data)
+
+class AsyncRequest(asyncore.dispatcher):
+    def __init__(self, map, host, url, body, future):
+        asyncore.dispatcher.__init__(self, map=map)
+        self.future = future
+        self.incoming = []
+        self.outgoing = ("POST %s HTTP/1.1\r\n"
+                         "Host: %s\r\n"
+                         "Content-Type: application/json\r\n"
+                         "Content-Length: %d\r\n"
+                         "Connection: close\r\n\r\n%s") % (url, host, len(body), body)
+
+        address, sep, port = host.partition(":")
+        self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.connect((address, int(port or 80)))
+
+    def writable(self):
+        return len(self.outgoing) > 0
+
+    def handle_connect(self):
+        pass
+
+    def handle_write(self):
+        sent = self.send(self.outgoing)
+        self.outgoing = self.outgoing[sent:]
+
+    def handle_read(self):
+        data = self.recv(65536)
+        if data:
+            self.incoming.append(data)
+
+    def handle_close(self):
+        self.close()
+        try:
+            response = HTTPResponse(BufferSocket("".join(self.incoming)))
+            response.begin()
+            self.future.set_result((response.status, response.reason, response.read()))
+        except HTTPException as e:
+            self.future.set_exception(CronicleError(100, "API call failed: %s." % str(e)))
+
+    def handle_error(self):
+        error = sys.exc_info()[1]
+        self.close()
+        self.future.set_exception(CronicleError(100, "API call failed: %s." % str(error)))
+
+class AsyncHookChannel(asynchat.async_chat):
+    def __init__(self, sock, manager, map):
+        asynchat.async_chat.__init__(self, sock, map=map)
+        self.manager = manager
+        self.reset()
+
+    def reset(self):
+        self.incoming = []
+        self.headers = None
+        self.set_terminator("\r\n\r\n")
+
+    def collect_incoming_data(self, data):
+        self.incoming.append(data)
+
+    def found_terminator(self):
+        data = "".join(self.incoming)
+        self.incoming = []
+
+        if self.headers is None:
+            lines = data.split("\r\n")
+            self.path = lines[0].split(" ")[1]
+            self.headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                self.headers[name.strip().lower()] = value.strip()
+
+            length = int(self.headers.get("content-length", 0))
+            if length > 0:
+                self.set_terminator(length)
+                return
+            data = ""
+
+        try:
+            data = json.loads(data)
+        except ValueError:
+            self.push("HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            self.close_when_done()
+            return
+
+        self.push("HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+        self.reset()
+
+        start = time.time()
+        try:
+            self.manager.handle_request(self.path, data)
+        except Exception as e:
+            if not isinstance(e, CronicleError):
+                e = CronicleError(e)
+            sys.stderr.write("%s\n" % str(e))
+        recorder.add_sample("hook_dispatch", time.time() - start)
+
+class AsyncHookServer(asyncore.dispatcher):
+    def __init__(self, manager, address, map):
+        asyncore.dispatcher.__init__(self, map=map)
+        self.manager = manager
+        self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.set_reuse_addr()
+        self.bind((address, 0))
+        self.listen(128)
+        self.server_port = self.socket.getsockname()[1]
+
+    def handle_accept(self):
+        pair = self.accept()
+        if pair is not None:
+            AsyncHookChannel(pair[0], self.manager, self._map)
+
+class AsyncCronicleJob(CronicleJob):
+    def update_status(self, max_age = None):
+        future = self.api.call_api("get_job_status", { "id": self.id })
+        def updated(future):
+            if future.exception() is None:
+                self.set_status(future.result()["job"])
+        future.add_done_callback(updated)
+        return future
+
+    def on_job_complete(self, data):
+        if data["id"] != self.id:
+            raise CronicleError(100, "Received a complete notification for the wrong job.")
+        self.hook_complete_data = data
+
+        # The hook carries the final job state, only ask the API if it is
+        # missing.
+        job = dict((k, v) for (k, v) in data.items() if k != "action")
+        job["complete"] = 1
+        if "code" in data and "elapsed" in data:
+            self.set_status(job)
+            self.complete_future.set_result(self)
+            return
+
+        def updated(future):
+            if future.exception() is not None:
+                # Fall back to what the hook told us about the job.
+                self.set_status(job)
+            self.complete_future.set_result(self)
+        self.update_status().add_done_callback(updated)
+
+    def on_complete(self, callback):
+        self.complete_future.add_done_callback(lambda future: callback(self))
+
+    def wait_for_complete(self):
+        return self.complete_future
+
+class AsyncQueuedJob:
+    def __init__(self, api, event):
+        self.api = api
+        self.event = event
+        self.job = None
+        self.job_future = Future()
+
+    def on_job_start(self, job):
+        self.job = job
+        self.job_future.set_result(job)
+
+    def on_job_launch_failure(self):
+        self.job_future.set_exception(CronicleError(101, "Event %s failed to start." % self.event.title))
+
+    def on_launch_error(self, error):
+        self.job_future.set_exception(error)
+
+    def wait_for_job(self):
+        return self.job_future
+
+class AsyncHook(Hook):
+    def on_hook_data(self, data):
+        next_hook = self.event.web_hook
+        if next_hook is not None:
+            self.api.post(next_hook, data)
+        return Hook.on_hook_data(self, data)
+
+    def on_job_start(self, data):
+        if self.job is not None:
+            raise CronicleError(100, "Saw job_start for a job that already started.")
+        self.job = AsyncCronicleJob(self.api, self.event, data)
+        self.queued_job.on_job_start(self.job)
+
+class AsyncHookManager:
+    def __init__(self, api):
+        self.api = api
+        self.address = "127.0.0.1"
+        self.server = AsyncHookServer(self, self.address, api.map)
+        self.hooks = {}
+
+    def handle_request(self, path, data):
+        id = path[1:]
+        if id not in self.hooks:
+            raise CronicleError(100, "Saw a request for an unknown web hook.")
+        if not self.hooks[id].on_hook_data(data):
+            del self.hooks[id]
+
+    def run_event(self, event):
+        if event.multiplex:
+            raise CronicleError(100, "Asynchronous API does not support running multiplexed events.")
+
+        queued_job = AsyncQueuedJob(self.api, event)
+        hook_id = str(uuid4())
+        self.hooks[hook_id] = AsyncHook(self.api, event, queued_job)
+
+        new_hook_url = "http://%s:%s/%s" % (self.address, self.server.server_port, hook_id)
+        future = self.api.call_api("run_event", { "id": event.id, "web_hook": new_hook_url })
+        def launched(future):
+            if future.exception() is not None:
+                self.hooks.pop(hook_id, None)
+                queued_job.on_launch_error(future.exception())
+        future.add_done_callback(launched)
+
+        return queued_job
+
+class AsyncCronicleAPI:
+    def __init__(self, host, key):
+        self.key = key
+        self.map = {}
+        self.hook_manager = None
+        self.poller = None
+
+        self.url = urljoin(host, "/api/")
+        parts = urlparse(self.url)
+        if parts[0] != "http":
+            raise CronicleError(100, "Unsupported scheme for API: %s." % host)
+
+        self.host = parts[1]
+
+    def request(self, host, url, body):
+        future = Future()
+        try:
+            AsyncRequest(self.map, host, url, body, future)
+        except socket.error as e:
+            future.set_exception(CronicleError(100, "API call failed: %s." % str(e)))
+        return future
+
+    def post(self, url, data):
+        return self.request(urlparse(url)[1], url, json.dumps(data))
+
+    def call_api(self, name, params):
+        url = urljoin(self.url, "app/%s/v1" % name)
+        params["api_key"] = self.key
+
+        start = time.time()
+        result = Future()
+        def complete(future):
+            recorder.add_sample("api_%s" % name, time.time() - start)
+            if future.exception() is not None:
+                result.set_exception(future.exception())
+                return
+            try:
+                result.set_result(parse_result(*future.result()))
+            except CronicleError as e:
+                result.set_exception(e)
+        self.request(self.host, url, json.dumps(params)).add_done_callback(complete)
+        return result
+
+    def get_event(self, id = None, title = None):
+        params = {}
+        if id is not None and len(id) > 0:
+            params["id"] = id
+        elif title is not None and len(title) > 0:
+            params["title"] = title
+        else:
+            raise CronicleError(100, "Attempt to retrieve an event with no id or title.")
+
+        result = Future()
+        def complete(future):
+            if future.exception() is not None:
+                result.set_exception(future.exception())
+            else:
+                result.set_result(CronicleEvent(self, future.result()["event"]))
+        self.call_api("get_event", params).add_done_callback(complete)
+        return result
+
+    def run_event(self, event):
+        if self.hook_manager is None:
+            self.hook_manager = AsyncHookManager(self)
+        return self.hook_manager.run_event(event)
+
+    def run_until_complete(self, futures, timeout = None):
+        if isinstance(futures, Future):
+            futures = [futures]
+        end = None if timeout is None else time.time() + timeout
+
+        while not all(future.done() for future in futures):
+            if len(self.map) == 0 or (end is not None and time.time() >= end):
+                break
+            asyncore.loop(timeout = 0.1, use_poll = True, map = self.map, count = 1)
+
+        return [future for future in futures if future.done()]
@@ -1,14 +1,41 @@
 import json
+import time
+import socket
 from urlparse import urlparse, urljoin
-from httplib import HTTPConnection, HTTPException
+from httplib import HTTPException
 from .error import CronicleError
+from .connection import ConnectionPool
+from .catalog import EventCatalog
+from .poller import JobPoller
+from .retry import RetryPolicy, CircuitBreaker
+from .perf import recorder
+from .utils import Lock
 from .hookmanager import HookManager
 from .event import CronicleEvent
 
+def parse_result(status, reason, data):
+    if status <200 or status >=300:
+        raise CronicleError(100, "API call failed: %d %s." % (status, reason))
+
+    try:
+        result = json.loads(data)
+    except:
+        raise CronicleError(100, "API call returned unparsable data.")
+
+    if result["code"] != 0:
+        raise CronicleError(100, "API call failed with result: '(%s) %s'." % (result["code"], result["description"]))
+
+    return result
+
 class CronicleAPI:
-    def __init__(self, host, key):
+    connect_timeout = 10
+    read_timeout = 60
+
+    def __init__(self, host, key, cache_file = None, cache_ttl = 300):
         self.key = key
         self.hook_manager = None
+        self.lock = Lock()
+        self.catalog = EventCatalog(self, cache_ttl, cache_file)
 
         self.url = urljoin(host, "/api/")
         parts = urlparse(self.url)
@@ -16,39 +43,70 @@ class CronicleAPI:
             raise CronicleError(100, "Unsupported scheme for API: %s." % host)
 
         self.host = parts[1]
+        self.pool = ConnectionPool(self.host, connect_timeout = self.connect_timeout, read_timeout = self.read_timeout)
+        self.breaker = CircuitBreaker()
+        self.default_retry = RetryPolicy()
+        self.retry_policies = {
+            # Launching is not idempotent, a retry could run the event twice.
+            "run_event": RetryPolicy(attempts = 1),
+            "get_job_status": RetryPolicy(attempts = 4, backoff = 1),
+        }
+        self.poller = JobPoller(self)
 
     def run_event(self, event):
-        if self.hook_manager is None:
-            self.hook_manager = HookManager(self)
+        with self.lock:
+            if self.hook_manager is None:
+                self.hook_manager = HookManager(self)
         return self.hook_manager.run_event(event)
 
+    def close(self):
+        if self.hook_manager is not None:
+            self.hook_manager.relay.drain(10)
+        self.pool.close()
+
     def call_api(self, name, params):
+        policy = self.retry_policies.get(name, self.default_retry)
+        deadline = time.time() + policy.deadline
+        attempt = 0
+
+        while True:
+            self.breaker.check()
+            try:
+                # No single attempt may outlast the policy's deadline.
+                status, reason, data = self.request(name, params, max(deadline - time.time(), 0.001))
+            except CronicleError as e:
+                if self.breaker.record_failure():
+                    recorder.add_count("api_breaker_trips")
+
+                attempt += 1
+                delay = policy.delay(attempt - 1)
+                if attempt >= policy.attempts or time.time() + delay >= deadline:
+                    raise
+                recorder.add_count("api_retries")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return parse_result(status, reason, data)
+
+    def request(self, name, params, timeout = None):
         url = urljoin(self.url, "app/%s/v1" % name)
         params["api_key"] = self.key
         headers = {
             "Content-Type": "application/json",
         }
 
+        start = time.time()
         try:
-            connection = HTTPConnection(self.host)
-            connection.request("POST", url, json.dumps(params), headers)
-
-            response = connection.getresponse()
-        except HTTPException as e:
+            status, reason, data = self.pool.request("POST", url, json.dumps(params), headers, timeout)
+        except (HTTPException, socket.error) as e:
             raise CronicleError(100, "API call failed: %s." % str(e))
+        finally:
+            recorder.add_sample("api_%s" % name, time.time() - start)
 
-        if response.status <200 or response.status >=300:
-            raise CronicleError(100, "API call failed: %d %s." % (response.status, response.reason))
-
-        try:
-            result = json.loads(response.read())
-        except:
-            raise CronicleError(100, "API call returned unparsable data.")
-
-        if result["code"] != 0:
-            raise CronicleError(100, "API call failed with result: '(%s) %s'." % (result["code"], result["description"]))
-
-        return result
+        if status >= 500:
+            raise CronicleError(100, "API call failed: %d %s." % (status, reason))
+        return (status, reason, data)
 
     def get_event(self, id = None, title = None):
         params = {}
@@ -59,5 +117,21 @@ class CronicleAPI:
         else:
             raise CronicleError(100, "Attempt to retrieve an event with no id or title.")
 
-        event = self.call_api("get_event", params)["event"]
+        event = None
+        # Past its TTL the index may be stale, only trust it once reloaded.
+        if self.catalog.ensure_loaded(fetch = False):
+            event = self.catalog.find(id, title)
+        if event is None:
+            event = self.call_api("get_event", params)["event"]
+            self.catalog.add(event)
         return CronicleEvent(self, event)
+
+    def get_events(self, ids = None, titles = None):
+        self.catalog.ensure_loaded()
+
+        events = []
+        for id in ids or []:
+            events.append(self.get_event(id = id))
+        for title in titles or []:
+            events.append(self.get_event(title = title))
+        return events
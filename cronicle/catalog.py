@@ -0,0 +1,98 @@
+import os
+import json
+import time
+from .utils import Lock
+
+class EventCatalog:
+    def __init__(self, api, ttl = 300, cache_file = None):
+        self.api = api
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self.loaded = None
+        self.by_id = {}
+        self.by_title = {}
+        self.lock = Lock()
+
+    @property
+    def is_fresh(self):
+        return self.loaded is not None and time.time() - self.loaded < self.ttl
+
+    def index(self, events, loaded):
+        by_id = {}
+        by_title = {}
+        for event in events:
+            by_id[event["id"]] = event
+            if event["title"] not in by_title:
+                by_title[event["title"]] = event
+
+        with self.lock:
+            self.by_id = by_id
+            self.by_title = by_title
+            self.loaded = loaded
+
+    def load_cache(self):
+        if self.cache_file is None or not os.path.exists(self.cache_file):
+            return False
+
+        try:
+            with open(self.cache_file) as file:
+                cache = json.load(file)
+        except (IOError, ValueError):
+            return False
+
+        if time.time() - cache["time"] >= self.ttl:
+            return False
+
+        self.index(cache["events"], cache["time"])
+        return True
+
+    def save_cache(self):
+        if self.cache_file is None:
+            return
+
+        with self.lock:
+            cache = { "time": self.loaded, "events": self.by_id.values() }
+
+        temp = "%s.%d" % (self.cache_file, os.getpid())
+        try:
+            with open(temp, "w") as file:
+                json.dump(cache, file)
+            os.rename(temp, self.cache_file)
+        except (IOError, OSError):
+            pass
+
+    def refresh(self):
+        loaded = time.time()
+        rows = self.api.call_api("get_schedule", { "offset": 0, "limit": 1000000 })["rows"]
+        self.index(rows, loaded)
+        self.save_cache()
+
+    def ensure_loaded(self, fetch = True):
+        if self.is_fresh:
+            return True
+        if self.load_cache():
+            return True
+        if fetch:
+            self.refresh()
+            return True
+        return False
+
+    def add(self, event):
+        with self.lock:
+            self.by_id[event["id"]] = event
+            if event["title"] not in self.by_title:
+                self.by_title[event["title"]] = event
+
+    def find(self, id = None, title = None):
+        with self.lock:
+            if id is not None and len(id) > 0:
+                return self.by_id.get(id)
+            if title is not None and len(title) > 0:
+                return self.by_title.get(title)
+        return None
+
+    def invalidate(self):
+        with self.lock:
+            self.loaded = None
+            self.by_id = {}
+            self.by_title = {}
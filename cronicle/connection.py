@@ -0,0 +1,86 @@
+import time
+import errno
+import socket
+from httplib import HTTPConnection, HTTPException, BadStatusLine
+from .utils import Lock
+
+def is_stale(error, sent):
+    # An idle connection the server has already closed either fails while
+    # the request is written or returns no status line at all. Anything else,
+    # a timeout in particular, may have reached the server.
+    if isinstance(error, socket.timeout):
+        return False
+    if not sent:
+        return isinstance(error, socket.error) and error.errno in [errno.EPIPE, errno.ECONNRESET]
+    return isinstance(error, BadStatusLine) and (error.line in ["", "''"] or error.line.startswith("No status line"))
+
+class ConnectionPool:
+    def __init__(self, host, max_idle = 4, idle_timeout = 30, connect_timeout = None, read_timeout = None):
+        self.host = host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.idle = []
+        self.lock = Lock()
+
+    def create_connection(self):
+        return HTTPConnection(self.host, timeout = self.connect_timeout)
+
+    def acquire(self):
+        now = time.time()
+        with self.lock:
+            while len(self.idle) > 0:
+                connection, last_used = self.idle.pop()
+                if now - last_used < self.idle_timeout:
+                    return (connection, True)
+                connection.close()
+        return (self.create_connection(), False)
+
+    def release(self, connection):
+        now = time.time()
+        with self.lock:
+            self.idle.append((connection, now))
+            expired = [c for (c, t) in self.idle if now - t >= self.idle_timeout]
+            self.idle = [(c, t) for (c, t) in self.idle if now - t < self.idle_timeout]
+            while len(self.idle) > self.max_idle:
+                expired.append(self.idle.pop(0)[0])
+        for connection in expired:
+            connection.close()
+
+    def close(self):
+        with self.lock:
+            idle = self.idle
+            self.idle = []
+        for connection, last_used in idle:
+            connection.close()
+
+    def request(self, method, url, body = None, headers = {}, timeout = None):
+        read_timeout = self.read_timeout
+        if timeout is not None:
+            read_timeout = timeout if read_timeout is None else min(read_timeout, timeout)
+
+        while True:
+            connection, reused = self.acquire()
+            sent = False
+            try:
+                connection.request(method, url, body, headers)
+                sent = True
+                if connection.sock is not None:
+                    connection.sock.settimeout(read_timeout)
+                response = connection.getresponse()
+                data = response.read()
+            except (HTTPException, socket.error) as e:
+                connection.close()
+                # Retry once on a fresh socket only when the server never saw
+                # the request, every other retry is up to the caller.
+                if reused and is_stale(e, sent):
+                    continue
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self.release(connection)
+
+            return (response.status, response.reason, data)
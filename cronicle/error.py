@@ -1,5 +1,3 @@
-import inspect
-
 class CronicleError(Exception):
     def __init__(self, *args):
         if len(args) == 1:
@@ -10,6 +8,7 @@ class CronicleError(Exception):
             self.init_with_code(1, "CronicleError called with too many arguments.")
 
     def init_with_exception(self, e):
+        import inspect
         trace = inspect.trace()[-1]
         self.code = -1
         self.description = "%s: %s (%s:%s)." % (type(e).__name__, str(e), trace[1], trace[2])
@@ -0,0 +1,160 @@
+import sys
+import time
+import threading
+from Queue import Queue, Empty
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+CANCELLED = "CANCELLED"
+FINISHED = "FINISHED"
+
+class CancelledError(Exception):
+    pass
+
+class TimeoutError(Exception):
+    pass
+
+class Future:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.state = PENDING
+        self.value = None
+        self.error = None
+        self.callbacks = []
+
+    def run_callbacks(self):
+        for callback in self.callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                sys.stderr.write("Future callback failed: %s\n" % str(e))
+        self.callbacks = []
+
+    def cancel(self):
+        with self.condition:
+            if self.state in [RUNNING, FINISHED]:
+                return False
+            if self.state == CANCELLED:
+                return True
+            self.state = CANCELLED
+            self.condition.notify_all()
+        self.run_callbacks()
+        return True
+
+    def cancelled(self):
+        with self.condition:
+            return self.state == CANCELLED
+
+    def running(self):
+        with self.condition:
+            return self.state == RUNNING
+
+    def done(self):
+        with self.condition:
+            return self.state in [CANCELLED, FINISHED]
+
+    def wait(self, timeout = None):
+        with self.condition:
+            if self.state not in [CANCELLED, FINISHED]:
+                self.condition.wait(timeout)
+            if self.state == CANCELLED:
+                raise CancelledError()
+            if self.state != FINISHED:
+                raise TimeoutError()
+
+    def result(self, timeout = None):
+        self.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def exception(self, timeout = None):
+        self.wait(timeout)
+        return self.error
+
+    def add_done_callback(self, callback):
+        with self.condition:
+            if self.state not in [CANCELLED, FINISHED]:
+                self.callbacks.append(callback)
+                return
+        callback(self)
+
+    def set_running_or_notify_cancel(self):
+        with self.condition:
+            if self.state == CANCELLED:
+                return False
+            self.state = RUNNING
+            return True
+
+    def set_result(self, result):
+        with self.condition:
+            if self.state in [CANCELLED, FINISHED]:
+                return
+            self.value = result
+            self.state = FINISHED
+            self.condition.notify_all()
+        self.run_callbacks()
+
+    def set_exception(self, exception):
+        with self.condition:
+            if self.state in [CANCELLED, FINISHED]:
+                return
+            self.error = exception
+            self.state = FINISHED
+            self.condition.notify_all()
+        self.run_callbacks()
+
+FIRST_COMPLETED = "FIRST_COMPLETED"
+FIRST_EXCEPTION = "FIRST_EXCEPTION"
+ALL_COMPLETED = "ALL_COMPLETED"
+
+def as_completed(futures, timeout = None):
+    # Every future reports into one queue, so a single thread can watch any
+    # number of them without polling each in turn.
+    futures = set(futures)
+    end = None if timeout is None else time.time() + timeout
+    completed = Queue()
+    for future in futures:
+        future.add_done_callback(completed.put)
+
+    for i in range(len(futures)):
+        if end is None:
+            yield completed.get()
+            continue
+
+        try:
+            yield completed.get(timeout = max(end - time.time(), 0))
+        except Empty:
+            raise TimeoutError("%d of %d futures unfinished." % (len(futures) - i, len(futures)))
+
+def wait(futures, timeout = None, return_when = ALL_COMPLETED):
+    futures = set(futures)
+    done = set()
+    try:
+        for future in as_completed(futures, timeout):
+            done.add(future)
+            if return_when == FIRST_COMPLETED:
+                break
+            if return_when == FIRST_EXCEPTION and not future.cancelled() and future.exception() is not None:
+                break
+    except TimeoutError:
+        pass
+
+    # Late arrivals while the loop exited still count as done.
+    done.update(future for future in futures if future.done())
+    return (done, futures - done)
+
+def wait_any(futures, timeout = None):
+    for future in as_completed(futures, timeout):
+        return future
+    return None
+
+def wait_all(futures, timeout = None):
+    futures = list(futures)
+    done, pending = wait(futures, timeout, FIRST_EXCEPTION)
+    for future in futures:
+        if future in done and not future.cancelled() and future.exception() is not None:
+            raise future.exception()
+    if len(pending) > 0:
+        raise TimeoutError("%d of %d futures unfinished." % (len(pending), len(futures)))
+    return [future.result() for future in futures]
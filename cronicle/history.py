@@ -0,0 +1,61 @@
+import os
+from .utils import Lock
+
+class JobHistory:
+    def __init__(self, path, max_samples = 10, compact_ratio = 4):
+        self.path = path
+        self.max_samples = max_samples
+        self.compact_ratio = compact_ratio
+        self.lock = Lock()
+        self.samples = {}
+        self.lines = 0
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path) as file:
+            for line in file:
+                id, sep, elapsed = line.rstrip("\n").partition("\t")
+                try:
+                    self.add_sample(id, float(elapsed))
+                except ValueError:
+                    continue
+                self.lines += 1
+
+    def add_sample(self, id, elapsed):
+        samples = self.samples.setdefault(id, [])
+        samples.append(elapsed)
+        if len(samples) > self.max_samples:
+            del samples[0]
+
+    def record(self, id, elapsed):
+        if elapsed is None:
+            return
+
+        with self.lock:
+            self.add_sample(id, float(elapsed))
+            with open(self.path, "a") as file:
+                file.write("%s\t%s\n" % (id, float(elapsed)))
+            self.lines += 1
+
+            kept = sum(len(samples) for samples in self.samples.values())
+            if self.lines > kept * self.compact_ratio:
+                self.compact()
+
+    def compact(self):
+        temp = "%s.%d" % (self.path, os.getpid())
+        with open(temp, "w") as file:
+            for id, samples in self.samples.items():
+                for elapsed in samples:
+                    file.write("%s\t%s\n" % (id, elapsed))
+        os.rename(temp, self.path)
+        self.lines = sum(len(samples) for samples in self.samples.values())
+
+    def estimate(self, id, default = None):
+        with self.lock:
+            samples = self.samples.get(id)
+            if not samples:
+                return default
+            return sum(samples) / len(samples)
@@ -1,63 +1,172 @@
+import os
 import re
 import sys
 import json
 import time
+import select
 import threading
+from Queue import Queue
 from uuid import uuid4
-from urlparse import urlparse
-from httplib import HTTPConnection
 from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
-from utils import Lock, DataEvent
+from utils import Lock
 from .error import CronicleError
-from .job import CronicleQueuedJob, CronicleJob
+from .job import CronicleQueuedJob, CronicleJob, CronicleJobGroup
+from .relay import HookRelay
+from .perf import recorder
 
 class HookRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    timeout = 10
+
     def log_request(self, code='-', size='-'):
         pass
 
+    def handle(self):
+        # One request per turn on a worker, the server waits for the next
+        # request on a keep-alive connection without holding a worker.
+        self.close_connection = 1
+        self.handle_one_request()
+
+    def send_status(self, code):
+        self.send_response(code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
     def do_POST(self):
         try:
             try:
-                data = json.loads(self.rfile.readline())
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length))
             except:
-                self.send_response(400)
+                self.close_connection = 1
+                self.send_status(400)
                 return
 
-            self.send_response(200)
-            self.server.manager.handle_request(self.path, data)
+            self.send_status(200)
+            self.server.dispatch(self.path, data)
         except Exception as e:
             if not isinstance(e, CronicleError):
                 e = CronicleError(e)
             sys.stderr.write("%s\n" % str(e))
 
 class HookServer(HTTPServer):
-    def __init__(self, manager, address):
+    request_queue_size = 128
+    idle_timeout = 30
+
+    def __init__(self, manager, address, workers = 32, dispatchers = 8):
         HTTPServer.__init__(self, (address, 0), HookRequestHandler)
         self.manager = manager
+        self.requests = Queue()
+
+        # Connections only reach the bounded pool of workers once they have
+        # data to read, so idle or silent clients never hold a worker.
+        self.parked = []
+        self.parked_lock = Lock()
+        self.wake_read, self.wake_write = os.pipe()
+        self.start_thread(self.watch_idle)
+        for i in range(workers):
+            self.start_thread(self.process_requests)
+
+        # Callbacks for the same hook always go to the same dispatcher so
+        # they are handled in the order they arrived.
+        self.dispatch_queues = []
+        for i in range(dispatchers):
+            queue = Queue()
+            self.dispatch_queues.append(queue)
+            self.start_thread(self.process_dispatches, queue)
 
-        self.thread = threading.Thread(target=self)
-        self.thread.daemon = True
-        self.thread.start()
+        self.thread = self.start_thread(self)
+
+    def start_thread(self, target, *args):
+        thread = threading.Thread(target=target, args=args)
+        thread.daemon = True
+        thread.start()
+        return thread
 
     def __call__(self):
         self.serve_forever()
 
+    def process_request(self, request, client_address):
+        self.park(request, client_address)
+
+    def park(self, request, client_address):
+        with self.parked_lock:
+            self.parked.append((request, client_address))
+        os.write(self.wake_write, "x")
+
+    def watch_idle(self):
+        poller = select.poll()
+        poller.register(self.wake_read, select.POLLIN)
+        idle = {}
+
+        while True:
+            for fd, event in poller.poll(1000):
+                if fd == self.wake_read:
+                    os.read(self.wake_read, 4096)
+                    continue
+                poller.unregister(fd)
+                request, client_address, since = idle.pop(fd)
+                self.requests.put((request, client_address))
+
+            with self.parked_lock:
+                parked = self.parked
+                self.parked = []
+            now = time.time()
+            for request, client_address in parked:
+                idle[request.fileno()] = (request, client_address, now)
+                poller.register(request, select.POLLIN)
+
+            for fd, (request, client_address, since) in idle.items():
+                if now - since >= self.idle_timeout:
+                    poller.unregister(fd)
+                    del idle[fd]
+                    self.shutdown_request(request)
+
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+
+    def process_requests(self):
+        while True:
+            request, client_address = self.requests.get()
+            handler = None
+            try:
+                handler = self.finish_request(request, client_address)
+            except:
+                self.handle_error(request, client_address)
+
+            if handler is not None and not handler.close_connection:
+                self.park(request, client_address)
+            else:
+                self.shutdown_request(request)
+
+    def dispatch(self, path, data):
+        queue = self.dispatch_queues[hash(path) % len(self.dispatch_queues)]
+        queue.put((path, data, time.time()))
+
+    def process_dispatches(self, queue):
+        while True:
+            path, data, received = queue.get()
+            try:
+                self.manager.handle_request(path, data)
+            except Exception as e:
+                if not isinstance(e, CronicleError):
+                    e = CronicleError(e)
+                sys.stderr.write("%s\n" % str(e))
+            recorder.add_sample("hook_dispatch", time.time() - received)
+
 class Hook:
-    def __init__(self, api, event, queued_job):
+    def __init__(self, api, event, queued_job, relay = None):
         self.api = api
         self.event = event
         self.queued_job = queued_job
+        self.relay = relay
         self.job = None
 
     def on_hook_data(self, data):
         next_hook = self.event.web_hook
-        if next_hook is not None:
-            try:
-                host = urlparse(next_hook)[1]
-                connection = HTTPConnection(host)
-                connection.request("POST", next_hook, json.dumps(data))
-            except:
-                pass
+        if next_hook is not None and self.relay is not None:
+            self.relay.post(next_hook, data)
 
         if data["action"] == "job_launch_failure":
             self.on_job_launch_failure()
@@ -80,18 +189,64 @@ class Hook:
     def on_job_launch_failure(self):
         if self.job is not None:
             raise CronicleError(100, "Saw job_launch_failure for a job that already started.")
-        self.queued_job.on_job_failure()
+        self.queued_job.on_job_launch_failure()
 
     def on_job_complete(self, data):
         if self.job is None:
             raise CronicleError(100, "Saw job_complete for a job that never started.")
         self.job.on_job_complete(data)
 
+class MultiplexHook(Hook):
+    def __init__(self, api, event, queued_job, relay = None):
+        Hook.__init__(self, api, event, queued_job, relay)
+        self.job = CronicleJobGroup(api, event)
+        self.notified = False
+        self.lock = Lock()
+
+    def set_job_ids(self, ids):
+        if len(ids) == 0:
+            # Nothing was launched, an empty group would look complete.
+            self.on_job_launch_failure()
+            return
+        self.job.set_ids(ids)
+        self.notify_started()
+
+    def notify_started(self):
+        if not self.job.all_started:
+            return
+        with self.lock:
+            if self.notified:
+                return
+            self.notified = True
+        self.queued_job.on_job_start(self.job)
+
+    def on_hook_data(self, data):
+        Hook.on_hook_data(self, data)
+        return not self.job.is_complete
+
+    def on_job_start(self, data):
+        self.job.add_job(CronicleJob(self.api, self.event, data))
+        self.notify_started()
+
+    def on_job_launch_failure(self):
+        with self.lock:
+            if self.notified:
+                return
+            self.notified = True
+        self.queued_job.on_job_launch_failure()
+
+    def on_job_complete(self, data):
+        job = self.job.find_job(data["id"])
+        if job is None:
+            raise CronicleError(100, "Saw job_complete for a job that never started.")
+        job.on_job_complete(data)
+
 class HookManager:
     def __init__(self, api):
         self.api = api
         self.address = "127.0.0.1"
         self.server = HookServer(self, self.address)
+        self.relay = HookRelay()
         self.hooks = {}
         self.lock = Lock()
 
@@ -114,16 +269,24 @@ class HookManager:
                 del self.hooks[id]
 
     def run_event(self, event):
-        if event.multiplex:
-            raise CronicleError(100, "API does not support running multiplexed events.")
-
         queued_job = CronicleQueuedJob(self.api, event)
+        if event.multiplex:
+            hook = MultiplexHook(self.api, event, queued_job, self.relay)
+        else:
+            hook = Hook(self.api, event, queued_job, self.relay)
 
         with self.lock:
             hook_id = self.create_hook_id()
-            self.hooks[hook_id] = Hook(self.api, event, queued_job)
+            self.hooks[hook_id] = hook
 
         new_hook_url = "http://%s:%s/%s" % (self.address, self.server.server_port, hook_id)
-        self.api.call_api("run_event", { "id": event.id, "web_hook": new_hook_url })
+        result = self.api.call_api("run_event", { "id": event.id, "web_hook": new_hook_url })
+
+        if event.multiplex:
+            ids = result.get("ids") or []
+            hook.set_job_ids(ids)
+            if len(ids) == 0 or hook.job.is_complete:
+                with self.lock:
+                    self.hooks.pop(hook_id, None)
 
         return queued_job
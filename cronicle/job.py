@@ -1,7 +1,8 @@
 import sys
 import time
 from .error import CronicleError
-from .utils import Lock, wait_for_callback
+from .utils import Lock
+from .futures import Future
 
 class CronicleJob:
     def __init__(self, api, event, hook_start_data):
@@ -12,42 +13,80 @@ class CronicleJob:
 
         self.lock = Lock()
         self.callbacks = []
+        self.complete_future = Future()
+        self.job = {}
+        self.updated = 0
 
-        self.update_status()
+        if self.api.poller is not None:
+            self.job = dict((k, v) for (k, v) in hook_start_data.items() if k != "action")
+            self.updated = time.time()
+            self.api.poller.register(self)
+        else:
+            self.update_status()
+
+    @property
+    def max_age(self):
+        if self.api.poller is None:
+            return None
+        return self.api.poller.freshness
 
     def on_job_complete(self, data):
         if data["id"] != self.id:
             raise CronicleError(100, "Received a complete notification for the wrong job.")
-        self.update_status(3)
+
+        # The hook carries the final job state, only ask the API if it is
+        # missing.
+        if "code" in data and "elapsed" in data:
+            job = dict((k, v) for (k, v) in data.items() if k != "action")
+            job["complete"] = 1
+            self.set_status(job)
+        else:
+            self.update_status()
+
         with self.lock:
             self.hook_complete_data = data
+        self.fire_complete()
+
+    def check_complete(self):
+        self.update_status(max_age = self.max_age)
+        if self.is_complete:
+            self.fire_complete()
+        return self.is_complete
+
+    def fire_complete(self):
+        if self.api.poller is not None:
+            self.api.poller.unregister(self)
+        with self.lock:
             callbacks = self.callbacks
             self.callbacks = None
-        for callback in callbacks:
+        for callback in callbacks or []:
             callback(self)
+        self.complete_future.set_result(self)
 
-    def update_status(self, retries = 0):
-        while True:
-            try:
-                job = self.api.call_api("get_job_status", { "id": self.id })["job"]
-                break
-            except Exception as e:
-                if retries == 0:
-                    raise
-                retries -= 1
-                time.sleep(2)
-
+    def set_status(self, job):
         with self.lock:
+            # Elapsed time and resource use move on every poll, only progress
+            # and completion count as a change.
+            changed = any(self.job.get(key) != job.get(key) for key in ["progress", "complete"])
             self.job = job
+            self.updated = time.time()
+        return changed
+
+    def update_status(self, max_age = None):
+        if max_age is not None and time.time() - self.updated < max_age:
+            return
+
+        self.set_status(self.api.call_api("get_job_status", { "id": self.id })["job"])
 
     def on_complete(self, callback):
-        if self.is_complete:
-            callback(self)
         with self.lock:
-            self.callbacks.append(callback)
+            if self.callbacks is not None:
+                self.callbacks.append(callback)
+                return
+        callback(self)
 
-    def wait_for_complete(self):
-        wait_for_callback(self.on_complete)
+    def wait_for_complete(self, timeout = None):
+        return self.complete_future.result(timeout)
 
     def safe_get(self, property, default = None):
         with self.lock:
@@ -89,6 +128,137 @@ class CronicleJob:
     def details_url(self):
         return self.hook_start_data["job_details_url"]
 
+class CronicleJobGroup:
+    def __init__(self, api, event):
+        self.api = api
+        self.event = event
+        self.ids = None
+        self.jobs = {}
+        self.completed = set()
+        # Counts of the launched ids seen so far, so each callback can check
+        # for the whole group without walking every job.
+        self.started_count = 0
+        self.completed_count = 0
+
+        self.lock = Lock()
+        self.callbacks = []
+        self.complete_future = Future()
+
+    def add_job(self, job):
+        with self.lock:
+            if job.id in self.jobs:
+                raise CronicleError(100, "Saw job_start for a job that already started.")
+            self.jobs[job.id] = job
+            if self.ids is not None and job.id in self.ids:
+                self.started_count += 1
+        job.on_complete(self.on_job_complete)
+
+    def find_job(self, id):
+        with self.lock:
+            return self.jobs.get(id)
+
+    def set_ids(self, ids):
+        with self.lock:
+            self.ids = set(ids)
+            self.started_count = len(self.ids.intersection(self.jobs))
+            self.completed_count = len(self.ids.intersection(self.completed))
+        if self.is_complete:
+            self.fire_complete()
+
+    def on_job_complete(self, job):
+        with self.lock:
+            if job.id in self.completed:
+                return
+            self.completed.add(job.id)
+            if self.ids is not None and job.id in self.ids:
+                self.completed_count += 1
+        if self.is_complete:
+            self.fire_complete()
+
+    def check_complete(self):
+        with self.lock:
+            jobs = [job for job in self.jobs.values() if job.id not in self.completed]
+        for job in jobs:
+            job.check_complete()
+        return self.is_complete
+
+    def fire_complete(self):
+        with self.lock:
+            callbacks = self.callbacks
+            self.callbacks = None
+        for callback in callbacks or []:
+            callback(self)
+        self.complete_future.set_result(self)
+
+    def update_status(self, max_age = None):
+        for job in self.all_jobs:
+            job.update_status(max_age)
+
+    def on_complete(self, callback):
+        with self.lock:
+            if self.callbacks is not None:
+                self.callbacks.append(callback)
+                return
+        callback(self)
+
+    def wait_for_complete(self, timeout = None):
+        return self.complete_future.result(timeout)
+
+    @property
+    def all_jobs(self):
+        with self.lock:
+            return self.jobs.values()
+
+    @property
+    def all_started(self):
+        with self.lock:
+            return self.ids is not None and self.started_count == len(self.ids)
+
+    @property
+    def id(self):
+        with self.lock:
+            return ", ".join(sorted(self.ids or self.jobs.keys()))
+
+    @property
+    def is_complete(self):
+        with self.lock:
+            return self.ids is not None and len(self.ids) > 0 and self.completed_count == len(self.ids)
+
+    @property
+    def is_failed(self):
+        return any(job.is_failed for job in self.all_jobs)
+
+    @property
+    def progress(self):
+        with self.lock:
+            count = len(self.ids) if self.ids is not None else len(self.jobs)
+            jobs = self.jobs.values()
+        if count == 0:
+            return 0.0
+        return sum(job.progress for job in jobs) / count
+
+    @property
+    def elapsed(self):
+        elapsed = [job.elapsed for job in self.all_jobs if job.elapsed is not None]
+        if len(elapsed) == 0:
+            return None
+        return max(elapsed)
+
+    @property
+    def code(self):
+        for job in self.all_jobs:
+            if job.is_failed:
+                return job.code
+        return 0
+
+    @property
+    def description(self):
+        return "; ".join("%s: %s" % (job.id, job.description) for job in self.all_jobs if job.is_failed)
+
+    @property
+    def details_url(self):
+        return ", ".join(job.details_url for job in self.all_jobs)
+
 class CronicleQueuedJob:
     def __init__(self, api, event):
         self.api = api
@@ -97,6 +267,7 @@ class CronicleQueuedJob:
         self.job = None
         self.callbacks = []
         self.started = False
+        self.job_future = Future()
 
     def on_job_start(self, job):
         with self.lock:
@@ -106,6 +277,7 @@ class CronicleQueuedJob:
             self.callbacks = None
         for callback in callbacks:
             callback(job)
+        self.job_future.set_result(job)
 
     def on_job_launch_failure(self):
         with self.lock:
@@ -114,17 +286,32 @@ class CronicleQueuedJob:
             self.callbacks = None
         for callback in callbacks:
             callback(None)
+        self.job_future.set_exception(CronicleError(101, "Event %s failed to start." % self.event.title))
 
     def on_job_started(self, callback):
         with self.lock:
-            if self.started:
-                callback(self.job)
+            if not self.started:
+                self.callbacks.append(callback)
                 return
-            self.callbacks.append(callback)
+        callback(self.job)
 
-    def wait_for_job(self):
-        job = wait_for_callback(self.on_job_started)
+    @property
+    def jobs(self):
+        with self.lock:
+            job = self.job
+        if job is None:
+            return []
+        if isinstance(job, CronicleJobGroup):
+            return job.all_jobs
+        return [job]
 
+    @property
+    def progress(self):
+        with self.lock:
+            job = self.job
         if job is None:
-            raise CronicleError(101, "Event %s failed to start." % self.event.title)
-        return job
+            return 0.0
+        return job.progress
+
+    def wait_for_job(self, timeout = None):
+        return self.job_future.result(timeout)
@@ -0,0 +1,45 @@
+from .utils import Lock, Ticker
+
+class OutputChannel:
+    def __init__(self, stream, batch_size = 65536, flush_interval = 0.5):
+        self.stream = stream
+        self.batch_size = batch_size
+        self.lock = Lock()
+        self.buffer = []
+        self.size = 0
+
+        self.ticker = None
+        if flush_interval > 0:
+            self.ticker = Ticker(self.flush, flush_interval)
+            self.ticker.start()
+
+    def write(self, line):
+        with self.lock:
+            self.buffer.append(line)
+            self.size += len(line) + 1
+            if self.size >= self.batch_size:
+                self.flush_buffer()
+
+    def write_record(self, line):
+        # Records carry progress, perf and results, Cronicle must see them
+        # straight away and after any lines logged before them.
+        with self.lock:
+            self.buffer.append(line)
+            self.flush_buffer()
+
+    def flush(self):
+        with self.lock:
+            if len(self.buffer) > 0:
+                self.flush_buffer()
+
+    def flush_buffer(self):
+        self.buffer.append("")
+        self.stream.write("\n".join(self.buffer))
+        self.stream.flush()
+        self.buffer = []
+        self.size = 0
+
+    def close(self):
+        if self.ticker is not None:
+            self.ticker.stop()
+        self.flush()
@@ -0,0 +1,63 @@
+from .utils import Lock
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if len(values) == 0:
+        return None
+    index = int(round(fraction * (len(values) - 1)))
+    return values[index]
+
+class PerfRecorder:
+    def __init__(self):
+        self.enabled = True
+        self.lock = Lock()
+        self.times = {}
+        self.samples = {}
+        self.counts = {}
+
+    def add_count(self, name, count = 1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    def add_time(self, name, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.times[name] = self.times.get(name, 0) + seconds
+
+    def add_sample(self, name, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            if name not in self.samples:
+                self.samples[name] = []
+            self.samples[name].append(seconds)
+
+    def reset(self):
+        with self.lock:
+            self.times = {}
+            self.samples = {}
+            self.counts = {}
+
+    def summary(self):
+        perf = {}
+        counts = {}
+        with self.lock:
+            perf.update(self.times)
+            counts.update(self.counts)
+            for name, samples in self.samples.items():
+                counts[name] = len(samples)
+                perf[name] = sum(samples)
+        return (perf, counts)
+
+    def percentiles(self):
+        rows = []
+        with self.lock:
+            for name in sorted(self.samples):
+                samples = self.samples[name]
+                rows.append((name, len(samples), percentile(samples, 0.5), percentile(samples, 0.9), percentile(samples, 0.99)))
+        return rows
+
+recorder = PerfRecorder()
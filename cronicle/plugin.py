@@ -1,8 +1,13 @@
+import re
 import sys
 import json
-import inspect
+import time
 import subprocess
 from .error import CronicleError
+from .progress import ProgressEmitter
+from .output import OutputChannel
+from .process import ProcessStream
+from .perf import recorder
 
 class ProcessLogParser:
     def parse_line(self, line):
@@ -12,32 +17,126 @@ class ProcessLogParser:
         if code != 0:
             raise CronicleError(code, "Process exited with exit code %d." % code)
 
+class SpooledLines:
+    def __init__(self, file, count):
+        self.file = file
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        self.file.seek(0)
+        for line in self.file:
+            yield line[:-1]
+
 class TextParser(ProcessLogParser):
-    def __init__(self):
+    def __init__(self, max_memory = 64 * 1024 * 1024):
+        self.max_memory = max_memory
         self.lines = []
+        self.size = 0
+        self.count = 0
+        self.spool = None
 
     def parse_line(self, line):
+        self.count += 1
+        if self.spool is not None:
+            self.spool.write("%s\n" % line)
+            return
+
         self.lines.append(line)
+        self.size += len(line)
+        if self.max_memory is not None and self.size > self.max_memory:
+            # Past the memory cap everything moves to a temporary file.
+            import tempfile
+            self.spool = tempfile.TemporaryFile()
+            for line in self.lines:
+                self.spool.write("%s\n" % line)
+            self.lines = None
 
     def process_complete(self, code):
         if (code != 0):
             return ProcessLogParser.process_complete(self, code)
+        if self.spool is not None:
+            self.spool.flush()
+            return SpooledLines(self.spool, self.count)
         return self.lines
 
-class JsonParser(TextParser):
-    def process_complete(self, code):
-        text = "\n".join(TextParser.process_complete(self, code))
+json_token_re = re.compile(r'[{}\[\]"\\]')
+
+class JsonParser(ProcessLogParser):
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.values = []
+        self.pending = []
+        self.depth = 0
+        self.in_string = False
+        self.error = False
+
+    def scan(self, line):
+        escape = None
+        for match in json_token_re.finditer(line):
+            token = match.group(0)
+            if match.start() == escape:
+                # Only the character right after a backslash is escaped, and
+                # it is only a token when it is a quote or a backslash.
+                continue
+            if self.in_string:
+                if token == "\\":
+                    escape = match.end()
+                elif token == '"':
+                    self.in_string = False
+            elif token == '"':
+                self.in_string = True
+            elif token == "{" or token == "[":
+                self.depth += 1
+            elif token == "}" or token == "]":
+                self.depth -= 1
+
+    def decode_pending(self):
+        text = "\n".join(self.pending)
+        self.pending = []
         try:
-            return json.loads(text)
-        except:
+            self.values.append(self.decoder.decode(text))
+        except ValueError:
+            self.error = True
+
+    def parse_line(self, line):
+        if self.error or (len(self.pending) == 0 and len(line.strip()) == 0):
+            return
+
+        self.pending.append(line)
+        self.scan(line)
+
+        # Decode each top level value as soon as it is complete so only the
+        # value currently arriving is held as text.
+        if self.depth == 0 and not self.in_string:
+            self.decode_pending()
+
+    def process_complete(self, code):
+        if (code != 0):
+            return ProcessLogParser.process_complete(self, code)
+        if self.error or len(self.pending) > 0 or len(self.values) == 0:
             raise CronicleError(2, "Process returned invalid json.")
+        if len(self.values) == 1:
+            return self.values[0]
+        return self.values
 
 class CroniclePlugin:
+    progress_step = 0.01
+    progress_interval = 1.0
+    output_batch_size = 65536
+    output_flush_interval = 0.5
+    read_chunk_size = 65536
+    instrument = True
+
     def __init__(self, start = True, stdin = sys.stdin, stdout = sys.stdout):
         self.stdin = stdin
         self.stdout = stdout
+        self.output = OutputChannel(stdout, self.output_batch_size, self.output_flush_interval)
         self.perf = {}
-        self.last_progress = 0.0
+        recorder.enabled = self.instrument
+        self.progress_emitter = ProgressEmitter(self.emit_progress, self.progress_step, self.progress_interval)
 
         if start:
             self.start()
@@ -49,12 +148,21 @@ class CroniclePlugin:
         result = { "complete": 1 }
 
         try:
+            start = time.time()
             try:
                 self.arguments = json.load(self.stdin)
             except:
                 raise CronicleError(1, "Invalid input arguments")
+            recorder.add_time("decode", time.time() - start)
 
             self.execute(self.arguments["params"])
+            self.progress_emitter.flush()
+
+            if self.progress_emitter.suppressed > 0:
+                self.set_count("progress_suppressed", self.progress_emitter.suppressed)
+
+            if self.instrument:
+                self.merge_instrumentation()
 
             if len(self.perf) > 0:
                 self.log_json({ "perf": self.perf })
@@ -65,38 +173,68 @@ class CroniclePlugin:
             result["code"] = e.code
             result["description"] = e.description
 
-        self.log(json.dumps(result))
-
-    def exec_process(self, args, parser, cwd = None):
+        self.log_json(result)
+        self.output.close()
+
+    def merge_instrumentation(self):
+        perf, counts = recorder.summary()
+        for name, value in perf.items():
+            if name not in self.perf:
+                self.perf[name] = value
+        for name, count in counts.items():
+            self.set_count(name, count)
+
+        # Cronicle adds perf values up as parts of the job's time, so the
+        # latency percentiles go in a table instead.
+        rows = [[name, count] + ["%.1f" % (value * 1000) for value in (p50, p90, p99)]
+                for (name, count, p50, p90, p99) in recorder.percentiles()]
+        if len(rows) > 0:
+            self.log_table("Latency (ms)", ["Measure", "Samples", "P50", "P90", "P99"], rows)
+
+    def exec_process(self, args, parser, cwd = None, stderr_parser = None, timeout = None, idle_timeout = None):
+        start = time.time()
         process = subprocess.Popen(args,
                                    cwd=cwd,
                                    bufsize=0,
                                    stdin=None,
                                    stdout=subprocess.PIPE,
-                                   stderr=subprocess.STDOUT)
+                                   stderr=subprocess.PIPE if stderr_parser is not None else subprocess.STDOUT)
+
+        recorder.add_time("spawn", time.time() - start)
 
-        line = process.stdout.readline()
-        while line:
-            parser.parse_line(line.strip())
-            line = process.stdout.readline()
+        stream = ProcessStream(process, self.read_chunk_size, timeout, idle_timeout)
+        stream.add(process.stdout, parser)
+        if stderr_parser is not None:
+            stream.add(process.stderr, stderr_parser)
+        stream.run()
 
         code = process.wait()
-        return parser.process_complete(code)
+        result = parser.process_complete(code)
+        if stderr_parser is not None:
+            stderr_parser.process_complete(code)
+        return result
 
     def log(self, line):
-        self.stdout.write("%s\n" % line)
-        self.stdout.flush()
+        if isinstance(line, unicode):
+            line = line.encode("utf-8")
+        self.output.write(str(line))
 
     def log_json(self, data):
-        self.log(json.dumps(data))
+        self.output.write_record(json.dumps(data))
+
+    def emit_progress(self, progress):
+        self.log_json({ "progress": progress })
 
     def set_progress(self, progress):
-        if progress != self.last_progress:
-            self.log_json({ "progress": progress })
+        self.progress_emitter.update(progress)
 
     def set_perf(self, name, time):
         self.perf[name] = time
 
+    def set_count(self, name, count):
+        # setdefault is atomic, repository workers set counts concurrently.
+        self.perf.setdefault("counts", {})[name] = count
+
     def log_table(self, title, headers, rows, caption = None):
         stats = {
             "table": {
@@ -0,0 +1,68 @@
+import sys
+import time
+import threading
+from .error import CronicleError
+from .utils import Lock
+
+class JobPoller:
+    def __init__(self, api, min_interval = 2, max_interval = 30, freshness = 5):
+        self.api = api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.freshness = freshness
+        self.interval = min_interval
+
+        self.jobs = {}
+        self.lock = Lock()
+        self.thread = None
+
+    def register(self, job):
+        with self.lock:
+            self.jobs[job.id] = job
+            self.interval = self.min_interval
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run)
+                self.thread.daemon = True
+                self.thread.start()
+
+    def unregister(self, job):
+        with self.lock:
+            self.jobs.pop(job.id, None)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                changed = self.refresh()
+            except Exception as e:
+                if not isinstance(e, CronicleError):
+                    e = CronicleError(e)
+                sys.stderr.write("%s\n" % str(e))
+                changed = False
+
+            with self.lock:
+                if changed:
+                    self.interval = self.min_interval
+                else:
+                    self.interval = min(self.interval * 2, self.max_interval)
+
+    def refresh(self):
+        with self.lock:
+            jobs = self.jobs.values()
+        if len(jobs) == 0:
+            return False
+
+        active = self.api.call_api("get_active_jobs", {})["jobs"]
+
+        changed = False
+        for job in jobs:
+            if job.id in active:
+                if job.set_status(active[job.id]):
+                    changed = True
+            else:
+                # No longer active so it has finished, fetch its final state
+                # however recently the job was last updated.
+                job.update_status()
+                job.check_complete()
+                changed = True
+        return changed
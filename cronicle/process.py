@@ -0,0 +1,116 @@
+import os
+import time
+import select
+from .error import CronicleError
+from .perf import recorder
+
+class ProcessStream:
+    def __init__(self, process, chunk_size = 65536, timeout = None, idle_timeout = None):
+        self.process = process
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.streams = {}
+
+    def add(self, file, parser):
+        self.streams[file.fileno()] = (parser, bytearray())
+
+    def parse_lines(self, fd, data):
+        parser, buffer = self.streams[fd]
+        buffer.extend(data)
+        started = time.time()
+
+        start = 0
+        end = buffer.find("\n")
+        while end >= 0:
+            parser.parse_line(str(buffer[start:end]).strip())
+            start = end + 1
+            end = buffer.find("\n", start)
+
+        # Keep the partial last line in place for the next chunk.
+        del buffer[:start]
+        recorder.add_time("parse_%s" % parser.__class__.__name__, time.time() - started)
+
+    def finish(self, fd):
+        parser, buffer = self.streams.pop(fd)
+        if len(buffer) > 0:
+            parser.parse_line(str(buffer).strip())
+
+    def wait_timeout(self, started, last_output):
+        now = time.time()
+        remaining = []
+        if self.timeout is not None:
+            remaining.append(started + self.timeout - now)
+        if self.idle_timeout is not None:
+            remaining.append(last_output + self.idle_timeout - now)
+        if len(remaining) == 0:
+            return None
+        return max(min(remaining), 0)
+
+    def check_timeouts(self, started, last_output):
+        now = time.time()
+        if self.timeout is not None and now - started >= self.timeout:
+            self.kill()
+            raise CronicleError(4, "Process timed out after %s seconds." % self.timeout)
+        if self.idle_timeout is not None and now - last_output >= self.idle_timeout:
+            self.kill()
+            raise CronicleError(4, "Process produced no output for %s seconds." % self.idle_timeout)
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.wait()
+        except OSError:
+            pass
+
+    def run(self):
+        started = time.time()
+        last_output = started
+        first_output = None
+
+        if hasattr(select, "poll"):
+            poller = select.poll()
+            for fd in self.streams:
+                poller.register(fd, select.POLLIN | select.POLLHUP | select.POLLERR)
+            def wait(timeout):
+                if timeout is not None:
+                    timeout = timeout * 1000
+                return [fd for (fd, event) in poller.poll(timeout)]
+        else:
+            poller = None
+            def wait(timeout):
+                return select.select(self.streams.keys(), [], [], timeout)[0]
+
+        while len(self.streams) > 0:
+            try:
+                ready = wait(self.wait_timeout(started, last_output))
+            except select.error:
+                continue
+
+            if len(ready) == 0:
+                self.check_timeouts(started, last_output)
+                continue
+
+            for fd in ready:
+                data = os.read(fd, self.chunk_size)
+                if len(data) == 0:
+                    if poller is not None:
+                        poller.unregister(fd)
+                    self.finish(fd)
+                else:
+                    if first_output is None:
+                        first_output = time.time()
+                        recorder.add_time("first_output", first_output - started)
+                    last_output = time.time()
+                    self.parse_lines(fd, data)
+
+            self.check_timeouts(started, last_output)
+
+        # The streams can close before the process exits, the wall clock
+        # limit still applies to the rest of its run.
+        while self.timeout is not None and self.process.poll() is None:
+            remaining = started + self.timeout - time.time()
+            if remaining <= 0:
+                self.kill()
+                raise CronicleError(4, "Process timed out after %s seconds." % self.timeout)
+            time.sleep(min(remaining, 0.05))
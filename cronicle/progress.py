@@ -0,0 +1,43 @@
+import time
+from .utils import Lock
+
+class ProgressEmitter:
+    def __init__(self, emit, min_step = 0.01, min_interval = 1.0):
+        self.emit = emit
+        self.min_step = min_step
+        self.min_interval = min_interval
+
+        self.lock = Lock()
+        self.emitted = 0.0
+        self.emitted_time = 0
+        self.pending = None
+        self.suppressed = 0
+
+    def update(self, progress):
+        now = time.time()
+        with self.lock:
+            if progress == self.emitted:
+                self.pending = None
+                self.suppressed += 1
+                return
+
+            if (abs(progress - self.emitted) < self.min_step or
+                now - self.emitted_time < self.min_interval):
+                self.pending = progress
+                self.suppressed += 1
+                return
+
+            self.emitted = progress
+            self.emitted_time = now
+            self.pending = None
+        self.emit(progress)
+
+    def flush(self):
+        with self.lock:
+            progress = self.pending
+            if progress is None:
+                return
+            self.emitted = progress
+            self.emitted_time = time.time()
+            self.pending = None
+        self.emit(progress)
@@ -0,0 +1,127 @@
+import sys
+import json
+import time
+import heapq
+import random
+import socket
+import threading
+from Queue import Queue, Full
+from urlparse import urlparse
+from httplib import HTTPException
+from .utils import Lock
+from .connection import ConnectionPool
+
+class RelayItem:
+    def __init__(self, url, data):
+        self.url = url
+        self.data = data
+        self.attempts = 0
+        self.due = 0
+
+class HookRelay:
+    def __init__(self, workers = 2, max_queue = 1000, retries = 3, backoff = 1.0, max_backoff = 30, timeout = 10):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+
+        self.queue = Queue(max_queue)
+        self.pools = {}
+        self.delayed = []
+        self.lock = Lock()
+        self.counters = {
+            "queued": 0,
+            "sent": 0,
+            "retried": 0,
+            "dropped": 0,
+            "overflow": 0,
+        }
+
+        for i in range(workers):
+            self.start_thread(self.process_queue)
+        self.start_thread(self.process_delayed)
+
+    def start_thread(self, target):
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def get_pool(self, host):
+        with self.lock:
+            if host not in self.pools:
+                self.pools[host] = ConnectionPool(host, connect_timeout = self.timeout, read_timeout = self.timeout)
+            return self.pools[host]
+
+    def drain(self, timeout):
+        end = time.time() + timeout
+        while time.time() < end:
+            with self.lock:
+                pending = self.counters["queued"] - self.counters["sent"] - self.counters["dropped"]
+            if pending <= 0:
+                return True
+            time.sleep(0.1)
+        return False
+
+    def post(self, url, data):
+        if not self.enqueue(RelayItem(url, data)):
+            return False
+        self.count("queued")
+        return True
+
+    def enqueue(self, item):
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except Full:
+            self.count("overflow")
+            return False
+
+    def send(self, item):
+        pool = self.get_pool(urlparse(item.url)[1])
+        status, reason, data = pool.request("POST", item.url, json.dumps(item.data),
+                                            { "Content-Type": "application/json" })
+        if status >= 500:
+            raise HTTPException("%d %s" % (status, reason))
+
+    def process_queue(self):
+        while True:
+            item = self.queue.get()
+            try:
+                self.send(item)
+                self.count("sent")
+            except (HTTPException, socket.error) as e:
+                self.retry(item, e)
+            except Exception as e:
+                # Anything else will fail again, drop it but keep the worker.
+                self.count("dropped")
+                sys.stderr.write("Dropped web hook to %s: %s\n" % (item.url, str(e)))
+
+    def retry(self, item, error):
+        item.attempts += 1
+        if item.attempts > self.retries:
+            self.count("dropped")
+            sys.stderr.write("Dropped web hook to %s: %s\n" % (item.url, str(error)))
+            return
+
+        self.count("retried")
+        delay = min(self.backoff * (2 ** (item.attempts - 1)), self.max_backoff)
+        item.due = time.time() + delay * random.uniform(0.5, 1.0)
+        with self.lock:
+            heapq.heappush(self.delayed, (item.due, item))
+
+    def process_delayed(self):
+        while True:
+            time.sleep(0.2)
+            now = time.time()
+            ready = []
+            with self.lock:
+                while len(self.delayed) > 0 and self.delayed[0][0] <= now:
+                    ready.append(heapq.heappop(self.delayed)[1])
+            for item in ready:
+                if not self.enqueue(item):
+                    self.count("dropped")
@@ -0,0 +1,49 @@
+import time
+import random
+from .error import CronicleError
+from .utils import Lock
+
+class RetryPolicy:
+    def __init__(self, attempts = 3, backoff = 0.5, max_backoff = 10, deadline = 60):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+
+    def delay(self, attempt):
+        # Full jitter spreads out retries from many clients at once.
+        return random.uniform(0, min(self.backoff * (2 ** attempt), self.max_backoff))
+
+class CircuitBreaker:
+    def __init__(self, threshold = 5, reset_timeout = 30):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.lock = Lock()
+        self.failures = 0
+        self.opened = None
+        self.trips = 0
+
+    def check(self):
+        with self.lock:
+            if self.opened is None:
+                return
+            if time.time() - self.opened < self.reset_timeout:
+                raise CronicleError(102, "API is unavailable, not retrying for %d seconds." %
+                                    (self.reset_timeout - (time.time() - self.opened)))
+            # Half open, let this call through as a trial. Another failure
+            # reopens the circuit straight away.
+            self.opened = None
+            self.failures = self.threshold - 1
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold and self.opened is None:
+                self.opened = time.time()
+                self.trips += 1
+                return True
+        return False
@@ -1,3 +1,4 @@
+import time
 import threading
 
 class Lock(threading.Thread):
@@ -11,41 +12,22 @@ class Lock(threading.Thread):
     def __exit__(self, exception_type, exception_value, traceback):
         self.lock.release()
 
-class DataEvent():
-    def __init__(self):
-        self.data = None
-        self.lock = Lock()
-        self.event = threading.Event()
-
-    def set(self, data):
-        with self.lock:
-            self.data = data
-        self.event.set()
-
-    def clear(self):
-        self.event.clear()
-        with self.lock:
-            self.data = None
-
-    def wait(self):
-        self.event.wait()
-        with self.lock:
-            return self.data
-
-class Flag:
-    def __init__(self):
-        self.value = False
-
-    def set(self):
-        self.value = True
-
-    def __nonzero__(self):
-        return self.value
-
-def wait_for_callback(func):
-    event = DataEvent()
-    def callback(data):
-        event.set(data)
-    func(callback)
-
-    return event.wait()
+class Ticker(threading.Thread):
+    def __init__(self, callback, interval):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.callback = callback
+        self.interval = interval
+        self.stopped = False
+
+    def run(self):
+        # A plain sleep avoids the busy polling that Python 2 uses for timed
+        # waits on locks and conditions.
+        while True:
+            time.sleep(self.interval)
+            if self.stopped:
+                return
+            self.callback()
+
+    def stop(self):
+        self.stopped = True
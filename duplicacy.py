@@ -1,107 +1,253 @@
 #! /usr/bin/env python
 
+import os
 import re
+import json
+import time
+import threading
+from Queue import Queue, Empty
 from cronicle import CronicleError, CroniclePlugin
 from cronicle.plugin import ProcessLogParser
+from cronicle.history import JobHistory
 
-log_re = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3} (?P<level>\S+) (?P<type>\S+) (?P<message>.+)$")
+quiet_levels = frozenset(["DEBUG", "TRACE"])
+
+def is_timestamp(date, time):
+    return (len(date) == 10 and date[4] == "-" and date[7] == "-" and
+            len(time) == 12 and time[2] == ":" and time[5] == ":" and time[8] == ".")
 
 class DuplicacyLogParser(ProcessLogParser):
+    # Maps a log type to the name of the method that annotates it.
+    annotators = {}
+    hidden_types = frozenset()
+
     def __init__(self, plugin):
         self.plugin = plugin
+        self.handlers = dict((type, getattr(self, name)) for (type, name) in self.annotators.items())
 
     def process_complete(self, code):
         if code in error_codes:
             raise CronicleError(code, error_codes[code])
         return ProcessLogParser.process_complete(self, code)
 
-    def parse_duplicacy_line(self, line):
-        match = log_re.match(line)
-        if match:
-            return { "level": match.group("level"), "type": match.group("type"), "message": match.group("message") }
-        else:
-            return None
+    def transferred(self):
+        return None
 
     def log_line(self, level, type, message):
-        if level != "DEBUG" and level != "TRACE":
+        if level not in quiet_levels and type not in self.hidden_types:
             self.plugin.log(message)
 
     def annotate_line(self, level, type, message):
-        pass
+        handler = self.handlers.get(type)
+        if handler is not None:
+            handler(level, type, message)
 
     def parse_line(self, line):
-        line_data = self.parse_duplicacy_line(line)
-        if line_data:
-            self.log_line(line_data["level"], line_data["type"], line_data["message"])
-            self.annotate_line(line_data["level"], line_data["type"], line_data["message"])
+        parts = line.split(" ", 4)
+        if len(parts) == 5 and len(parts[4]) > 0 and is_timestamp(parts[0], parts[1]):
+            self.log_line(parts[2], parts[3], parts[4])
+            self.annotate_line(parts[2], parts[3], parts[4])
         else:
             self.plugin.log(line)
 
+stats_names = {
+    "new_files": "New files",
+    "changed_files": "Changed files",
+    "unchanged_files": "Unchanged files",
+    "removed_files": "Removed files",
+    "file_chunks": "File chunks",
+    "metadata_chunks": "Metadata chunks",
+}
+
+stats_order = ["new_files", "changed_files", "unchanged_files", "removed_files", "file_chunks", "metadata_chunks"]
+
+size_units = {
+    "K": 1024,
+    "M": 1024 ** 2,
+    "G": 1024 ** 3,
+    "T": 1024 ** 4,
+}
+
+def parse_size(text):
+    text = text.replace(",", "")
+    if len(text) > 0 and text[-1] in size_units:
+        return int(float(text[:-1]) * size_units[text[-1]])
+    return int(text)
+
+def format_size(size):
+    for unit in ["T", "G", "M", "K"]:
+        if size >= size_units[unit]:
+            return "%.1f%s" % (float(size) / size_units[unit], unit)
+    return str(size)
+
+stats_keys = dict((name, key) for (key, name) in stats_names.items())
+
+stats_re = re.compile(r"(?:(?P<files>New files|Changed files|Unchanged files|Removed files): "
+                      r"(?P<file_count>[\d,]+) total, (?P<file_size>[\w,.]+) bytes)|"
+                      r"(?:(?P<chunks>File chunks|Metadata chunks): (?P<chunk_total>[\d,]+) total, [\w,.]+ bytes; "
+                      r"(?P<chunk_count>[\d,]+) new, [\w,.]+ bytes, (?P<chunk_size>[\w,.]+) bytes uploaded)")
+
+# One pass over an UPLOAD_PROGRESS line picks up the chunk and the overall
+# percentage, either may be missing.
+upload_re = re.compile(r"(?:(?P<action>Uploaded|Skipped) chunk \d+ size (?P<size>\d+))?"
+                       r"(?:.*?(?P<percent>\d+\.\d+)%)?")
+
+def parse_count(text):
+    return int(text.replace(",", ""))
+
 class BackupParser(DuplicacyLogParser):
+    annotators = {
+        "UPLOAD_PROGRESS": "annotate_upload_progress",
+        "BACKUP_STATS": "annotate_backup_stats",
+    }
+    hidden_types = frozenset(["UPLOAD_PROGRESS"])
+    rate_interval = 60
+    clock_interval = 16
+
     def __init__(self, plugin):
         DuplicacyLogParser.__init__(self, plugin)
-        self.percent_re = re.compile(r"(?P<percent>\d+\.\d+)%")
-
         self.stats = {}
+        self.stats_names = stats_names
 
-        self.stats_names = {
-            "new_files": "New files",
-            "changed_files": "Changed files",
-            "unchanged_files": "Unchanged files",
-            "removed_files": "Removed files",
-            "file_chunks": "File chunks",
-            "metadata_chunks": "Metadata chunks",
-        }
+        self.uploaded_bytes = 0
+        self.uploaded_chunks = 0
+        self.skipped_chunks = 0
+        self.upload_start = None
+        self.upload_end = None
+        self.window_start = None
+        self.window_bytes = 0
+        self.clock_chunks = 0
 
-        self.stats_re = {
-            "new_files": re.compile(r"New files: (?P<count>\d+) total, (?P<size>\w+) bytes"),
-            "changed_files": re.compile(r"Changed files: (?P<count>\d+) total, (?P<size>\w+) bytes"),
-            "unchanged_files": re.compile(r"Unchanged files: (?P<count>\d+) total, (?P<size>\w+) bytes"),
-            "removed_files": re.compile(r"Removed files: (?P<count>\d+) total, (?P<size>\w+) bytes"),
-            "file_chunks": re.compile(r"File chunks: \d+ total, \w+ bytes; (?P<count>\d+) new, \w+ bytes, (?P<size>\w+) bytes uploaded"),
-            "metadata_chunks": re.compile(r"Metadata chunks: \d+ total, \w+ bytes; (?P<count>\d+) new, \w+ bytes, (?P<size>\w+) bytes uploaded"),
-        }
+    def transferred(self):
+        if "file_chunks" not in self.stats and "metadata_chunks" not in self.stats:
+            return None
+        return sum(self.stats[stat]["size"] for stat in ["file_chunks", "metadata_chunks"] if stat in self.stats)
 
-    def log_line(self, level, type, message):
-        if type == "UPLOAD_PROGRESS":
-            return
-        DuplicacyLogParser.log_line(self, level, type, message)
+    def read_clock(self):
+        now = time.time()
+        self.clock_chunks = 0
+        if self.upload_start is None:
+            self.upload_start = now
+            self.window_start = now
+        self.upload_end = now
 
-    def annotate_line(self, level, type, message):
-        if type == "UPLOAD_PROGRESS":
-            match = self.percent_re.search(message)
-            if match:
-                self.plugin.set_progress(float(match.group("percent")) / 100)
-        elif type == "BACKUP_STATS":
-            for key in self.stats_re:
-                match = self.stats_re[key].search(message)
-                if match:
-                    self.stats[key] = { "count": match.group("count"), "size": match.group("size") }
+        if now - self.window_start >= self.rate_interval:
+            rate = self.window_bytes / (now - self.window_start)
+            self.plugin.log("Upload rate: %s/s" % format_size(int(rate)))
+            self.window_start = now
+            self.window_bytes = 0
+
+    def annotate_upload_progress(self, level, type, message):
+        action, size, percent = upload_re.match(message).groups()
+
+        if action is not None:
+            if action == "Skipped":
+                self.skipped_chunks += 1
+            else:
+                size = int(size)
+                self.uploaded_chunks += 1
+                self.uploaded_bytes += size
+                self.window_bytes += size
+
+            # Reading the clock on every chunk costs more than the rest of
+            # the line, so the upload window is sampled.
+            self.clock_chunks += 1
+            if self.upload_start is None or self.clock_chunks >= self.clock_interval:
+                self.read_clock()
+
+        if percent is not None:
+            self.plugin.set_progress(float(percent) / 100)
+
+    def annotate_backup_stats(self, level, type, message):
+        match = stats_re.search(message)
+        if match:
+            files, file_count, file_size, chunks, chunk_total, chunk_count, chunk_size = match.groups()
+            if files is not None:
+                self.stats[stats_keys[files]] = { "count": parse_count(file_count), "size": parse_size(file_size) }
+            else:
+                self.stats[stats_keys[chunks]] = { "count": parse_count(chunk_count), "size": parse_size(chunk_size),
+                                                   "total": parse_count(chunk_total) }
+
+    def throughput(self):
+        elapsed = 0
+        if self.upload_start is not None:
+            elapsed = self.upload_end - self.upload_start
+
+        total_chunks = sum(self.stats[stat]["total"] for stat in ["file_chunks", "metadata_chunks"] if stat in self.stats)
+        new_chunks = sum(self.stats[stat]["count"] for stat in ["file_chunks", "metadata_chunks"] if stat in self.stats)
+        uploaded = self.transferred()
+        if uploaded is None:
+            uploaded = self.uploaded_bytes
+
+        result = {
+            "elapsed": elapsed,
+            "bytes": uploaded,
+            "chunks": self.uploaded_chunks,
+            "bytes_per_sec": uploaded / elapsed if elapsed > 0 else 0,
+            "chunks_per_sec": self.uploaded_chunks / elapsed if elapsed > 0 else 0,
+            "dedup_ratio": None,
+        }
+        if total_chunks > 0:
+            result["dedup_ratio"] = float(new_chunks) / total_chunks
+        return result
 
     def process_complete(self, code):
         if code != 0:
             return DuplicacyLogParser.process_complete(self, code)
 
+        if self.clock_chunks > 0:
+            self.read_clock()
+
         if len(self.stats) > 0:
             rows = []
-            for stat in ["new_files", "changed_files", "unchanged_files", "removed_files", "file_chunks", "metadata_chunks"]:
+            for stat in stats_order:
                 if stat in self.stats:
-                    rows.append([self.stats_names[stat], self.stats[stat]["count"], self.stats[stat]["size"]])
+                    rows.append([self.stats_names[stat], self.stats[stat]["count"], format_size(self.stats[stat]["size"])])
 
             self.plugin.log_table("Backup statistics", ["Type", "Count", "Size"], rows)
 
+        throughput = self.throughput()
+        if throughput["elapsed"] > 0:
+            self.plugin.set_count("upload_bytes_per_sec", int(throughput["bytes_per_sec"]))
+            self.plugin.set_count("upload_chunks_per_sec", round(throughput["chunks_per_sec"], 2))
+            rows = [
+                ["Uploaded", format_size(throughput["bytes"])],
+                ["Chunks uploaded", throughput["chunks"]],
+                ["Chunks skipped", self.skipped_chunks],
+                ["Upload time", "%.1fs" % throughput["elapsed"]],
+                ["Upload rate", "%s/s" % format_size(int(throughput["bytes_per_sec"]))],
+                ["Chunk rate", "%.2f/s" % throughput["chunks_per_sec"]],
+            ]
+            if throughput["dedup_ratio"] is not None:
+                self.plugin.set_count("dedup_ratio", round(throughput["dedup_ratio"], 4))
+                rows.append(["New chunks", "%.1f%%" % (throughput["dedup_ratio"] * 100)])
+            self.plugin.log_table("Upload throughput", ["Measure", "Value"], rows)
+
 class CopyParser(DuplicacyLogParser):
+    annotators = {
+        "SNAPSHOT_COPY": "annotate_snapshot_copy",
+    }
+
     def __init__(self, plugin):
         DuplicacyLogParser.__init__(self, plugin)
         self.progress_re = re.compile(r"\((?P<done>\d+)/(?P<total>\d+)\)")
+        self.copied = None
 
-    def annotate_line(self, level, type, message):
-        if type == "SNAPSHOT_COPY":
-            match = self.progress_re.search(message)
-            if match:
-                self.plugin.set_progress(float(match.group("done")) / float(match.group("total")))
+    def transferred(self):
+        return self.copied
+
+    def annotate_snapshot_copy(self, level, type, message):
+        match = self.progress_re.search(message)
+        if match:
+            self.copied = int(match.group("done"))
+            self.plugin.set_progress(float(match.group("done")) / float(match.group("total")))
 
 class CheckParser(DuplicacyLogParser):
+    annotators = {
+        "SNAPSHOT_CHECK": "annotate_snapshot_check",
+        "SNAPSHOT_VERIFY": "annotate_snapshot_verify",
+    }
+
     def __init__(self, plugin):
         DuplicacyLogParser.__init__(self, plugin)
         self.total_revisions = 1
@@ -119,20 +265,19 @@ class CheckParser(DuplicacyLogParser):
         progress = (self.current_revision + float(current) / total) / self.total_revisions
         self.plugin.set_progress(progress)
 
-    def annotate_line(self, level, type, message):
-        if type == "SNAPSHOT_CHECK":
-            match = self.revision_re.match(message)
-            if match is not None:
-                self.log_revision_progress(int(match.group(1)), int(match.group(2)))
-            else:
-                match = self.initial_re.match(message)
-                if match is not None:
-                    self.total_revisions = int(match.group(1))
-                    print("TOTAL REVISIONS %d", self.total_revisions)
-        elif type == "SNAPSHOT_VERIFY":
-            match = self.file_re.match(message)
+    def annotate_snapshot_check(self, level, type, message):
+        match = self.revision_re.match(message)
+        if match is not None:
+            self.log_revision_progress(int(match.group(1)), int(match.group(2)))
+        else:
+            match = self.initial_re.match(message)
             if match is not None:
-                self.log_file_progress(int(match.group(1)), int(match.group(2)))
+                self.total_revisions = int(match.group(1))
+
+    def annotate_snapshot_verify(self, level, type, message):
+        match = self.file_re.match(message)
+        if match is not None:
+            self.log_file_progress(int(match.group(1)), int(match.group(2)))
 
 command_parsers = {
     "backup": BackupParser,
@@ -148,6 +293,111 @@ error_codes = {
     "101": "Runtime error.",
 }
 
+class ThreadTuner:
+    def __init__(self, path, min_threads = 1, max_threads = 32, max_samples = 5):
+        self.path = path
+        self.min_threads = min_threads
+        self.max_threads = max_threads
+        self.max_samples = max_samples
+        self.lock = threading.Lock()
+        self.rates = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path) as file:
+                    self.rates = json.load(file)
+            except (IOError, ValueError):
+                pass
+
+    def mean_rates(self, key):
+        rates = self.rates.get(key, {})
+        return dict((int(threads), sum(samples) / len(samples)) for (threads, samples) in rates.items() if len(samples) > 0)
+
+    def choose(self, key, default):
+        with self.lock:
+            rates = self.mean_rates(key)
+        if len(rates) == 0:
+            return default
+
+        # Hill climb from the best setting seen so far, trying an untested
+        # neighbour before settling on the best.
+        best = max(rates, key=lambda threads: rates[threads])
+        for threads in [best * 2, best // 2]:
+            if self.min_threads <= threads <= self.max_threads and threads not in rates:
+                return threads
+        return best
+
+    def record(self, key, threads, rate):
+        with self.lock:
+            samples = self.rates.setdefault(key, {}).setdefault(str(threads), [])
+            samples.append(rate)
+            del samples[:-self.max_samples]
+
+            temp = "%s.%d" % (self.path, os.getpid())
+            with open(temp, "w") as file:
+                json.dump(self.rates, file)
+            os.rename(temp, self.path)
+
+def strip_threads(arguments):
+    args = []
+    threads = None
+    parts = arguments.split()
+    i = 0
+    while i < len(parts):
+        if parts[i] == "-threads" and i + 1 < len(parts):
+            threads = int(parts[i + 1])
+            i += 2
+            continue
+        args.append(parts[i])
+        i += 1
+    return (" ".join(args), threads)
+
+def option_value(parts, option, default):
+    if option in parts and parts.index(option) + 1 < len(parts):
+        return parts[parts.index(option) + 1]
+    return default
+
+def storage_name(command, arguments):
+    parts = arguments.split()
+    if command == "copy":
+        # Copies name both ends, the destination sets the upload speed but
+        # the source still matters.
+        return "%s>%s" % (option_value(parts, "-from", "default"), option_value(parts, "-to", "default"))
+    return option_value(parts, "-storage", "default")
+
+def repository_names(repositories):
+    # Short names where they are unique, the full path where they are not.
+    names = [os.path.basename(repository.rstrip("/")) or repository for repository in repositories]
+    return [name if names.count(name) == 1 else repository for (name, repository) in zip(names, repositories)]
+
+class RepositoryPlugin:
+    # Tables the parent plugin merges across every repository.
+    merged_tables = frozenset(["Backup statistics", "Upload throughput"])
+
+    def __init__(self, plugin, repository, name):
+        self.plugin = plugin
+        self.repository = repository
+        self.name = name
+        self.weight = 1.0
+        self.progress = 0.0
+
+    def log(self, line):
+        self.plugin.log("[%s] %s" % (self.name, line))
+
+    def set_progress(self, progress):
+        self.progress = progress
+        self.plugin.update_progress()
+
+    def set_perf(self, name, time):
+        self.plugin.set_perf("%s: %s" % (self.name, name), time)
+
+    def set_count(self, name, count):
+        self.plugin.set_count("%s_%s" % (self.name, name), count)
+
+    def log_table(self, title, headers, rows, caption = None):
+        if title not in self.merged_tables:
+            self.plugin.log_table("%s: %s" % (self.name, title), headers, rows, caption)
+
 class DuplicacyPlugin(CroniclePlugin):
     def build_args(self, duplicacy, command, arguments):
         args = [duplicacy, "-debug", "-log", command]
@@ -157,15 +407,176 @@ class DuplicacyPlugin(CroniclePlugin):
             args.extend(arguments.split())
         return args
 
+    def create_parser(self, command, plugin):
+        if command not in command_parsers:
+            return DuplicacyLogParser(plugin)
+        return command_parsers[command](plugin)
+
     def execute(self, params):
-        args = self.build_args(params["duplicacy"], params["command"], params["arguments"])
+        self.duplicacy = params["duplicacy"]
+        self.command = params["command"]
+        self.arguments = params["arguments"]
 
-        if params["command"] not in command_parsers:
-            parser = DuplicacyLogParser(self)
-        else:
-            parser = command_parsers[params["command"]](self)
+        self.tuner = None
+        if params.get("tune_threads") and self.command in ["backup", "copy"]:
+            self.tuner = ThreadTuner(params.get("tuning_file") or
+                                     os.path.expanduser("~/.duplicacy-cronicle-threads.json"))
+
+        repositories = [r.strip() for r in params["repository"].strip().split("\n") if len(r.strip()) > 0]
+        if len(repositories) == 1:
+            self.run_repository(self, repositories[0])
+            return
+
+        history = None
+        if params.get("history_file"):
+            history = JobHistory(params["history_file"])
+
+        workers = int(params.get("workers") or 4)
+        self.run_repositories(repositories, workers, history)
+
+    def run_repository(self, plugin, repository):
+        parser = self.create_parser(self.command, plugin)
+        if self.tuner is None:
+            args = self.build_args(self.duplicacy, self.command, self.arguments)
+            self.exec_process(args, parser, cwd=repository)
+            return parser
+
+        arguments, threads = strip_threads(self.arguments)
+        key = "%s:%s:%s" % (self.command, repository, storage_name(self.command, arguments))
+        threads = self.tuner.choose(key, threads or 4)
+        args = self.build_args(self.duplicacy, self.command, arguments)
+        args.extend(["-threads", str(threads)])
+
+        start = time.time()
+        self.exec_process(args, parser, cwd=repository)
+        elapsed = time.time() - start
+
+        prefix = "" if plugin is self else "%s_" % plugin.name
+        self.set_count("%sthreads" % prefix, threads)
+        # Indexing before the first upload says nothing about the thread
+        # count, and a run with nothing to send says nothing at all.
+        if getattr(parser, "upload_start", None) is not None:
+            elapsed = parser.upload_end - parser.upload_start
+        transferred = parser.transferred()
+        if transferred and elapsed > 0:
+            rate = transferred / elapsed
+            self.tuner.record(key, threads, rate)
+            self.set_count("%stransfer_rate" % prefix, int(rate))
+        return parser
+
+    def run_repositories(self, repositories, workers, history):
+        self.repositories = [RepositoryPlugin(self, repository, name)
+                             for (repository, name) in zip(repositories, repository_names(repositories))]
+        if history is not None:
+            estimates = [history.estimate(repository) for repository in repositories]
+            known = [estimate for estimate in estimates if estimate is not None]
+            default = sum(known) / len(known) if len(known) > 0 else 1.0
+            for plugin, estimate in zip(self.repositories, estimates):
+                plugin.weight = max(estimate if estimate is not None else default, 0.001)
+
+        queue = Queue()
+        for plugin in self.repositories:
+            queue.put(plugin)
+
+        parsers = {}
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                try:
+                    plugin = queue.get_nowait()
+                except Empty:
+                    return
+
+                start = time.time()
+                try:
+                    parser = self.run_repository(plugin, plugin.repository)
+                except Exception as e:
+                    if not isinstance(e, CronicleError):
+                        e = CronicleError(e)
+                    plugin.log("Failed: %s" % e.description)
+                    with lock:
+                        errors.append((plugin, e))
+                    continue
+
+                elapsed = time.time() - start
+                plugin.set_progress(1.0)
+                self.set_perf(plugin.name, elapsed)
+                if history is not None:
+                    history.record(plugin.repository, elapsed)
+                with lock:
+                    parsers[plugin] = parser
+
+        threads = [threading.Thread(target=worker) for i in range(min(workers, len(self.repositories)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        results = [(plugin, parsers[plugin]) for plugin in self.repositories if plugin in parsers]
+        self.log_merged_stats(results)
+        self.log_merged_throughput(results)
+
+        if len(errors) > 0:
+            names = ", ".join(plugin.name for (plugin, e) in errors)
+            raise CronicleError(errors[0][1].code, "Failed for %d of %d repositories (%s)." %
+                                (len(errors), len(self.repositories), names))
+
+    def update_progress(self):
+        total = sum(plugin.weight for plugin in self.repositories)
+        self.set_progress(sum(plugin.weight * plugin.progress for plugin in self.repositories) / total)
+
+    def log_merged_stats(self, results):
+        rows = []
+        totals = {}
+        for plugin, parser in results:
+            stats = getattr(parser, "stats", {})
+            for stat in stats_order:
+                if stat not in stats:
+                    continue
+                count = stats[stat]["count"]
+                size = stats[stat]["size"]
+                rows.append([plugin.name, stats_names[stat], count, format_size(size)])
+                total = totals.setdefault(stat, [0, 0])
+                total[0] += count
+                total[1] += size
+
+        if len(rows) == 0:
+            return
+
+        for stat in stats_order:
+            if stat in totals:
+                rows.append(["Total", stats_names[stat], totals[stat][0], format_size(totals[stat][1])])
+
+        self.log_table("Backup statistics", ["Repository", "Type", "Count", "Size"], rows)
+
+    def log_merged_throughput(self, results):
+        rows = []
+        uploads = []
+        for plugin, parser in results:
+            if not hasattr(parser, "throughput"):
+                continue
+            throughput = parser.throughput()
+            if throughput["elapsed"] <= 0:
+                continue
+            rows.append([plugin.name, format_size(throughput["bytes"]), throughput["chunks"],
+                         "%.1fs" % throughput["elapsed"], "%s/s" % format_size(int(throughput["bytes_per_sec"]))])
+            uploads.append((parser.upload_start, parser.upload_end, throughput["bytes"], throughput["chunks"]))
+
+        if len(rows) == 0:
+            return
+
+        # Repositories upload in parallel, so the total rate is over the
+        # span from the first upload to the last.
+        elapsed = max(end for (start, end, size, chunks) in uploads) - min(start for (start, end, size, chunks) in uploads)
+        size = sum(size for (start, end, size, chunks) in uploads)
+        rate = size / elapsed if elapsed > 0 else 0
+        rows.append(["Total", format_size(size), sum(chunks for (start, end, size, chunks) in uploads),
+                     "%.1fs" % elapsed, "%s/s" % format_size(int(rate))])
+        self.set_count("upload_bytes_per_sec", int(rate))
 
-        self.exec_process(args, parser, cwd=params["repository"])
+        self.log_table("Upload throughput", ["Repository", "Uploaded", "Chunks", "Upload time", "Upload rate"], rows)
 
 if __name__ == "__main__":
     DuplicacyPlugin()
@@ -1,56 +1,208 @@
 #! /usr/bin/env python
 
-import time
+from Queue import Queue
 from cronicle import CronicleError, CroniclePlugin, CronicleAPI
-from cronicle.utils import Flag
+from cronicle.utils import Ticker
+from cronicle.history import JobHistory
+
+class SequenceStep:
+    def __init__(self, event, depends):
+        self.event = event
+        self.depends = depends
+        self.queue = None
+        self.job = None
+        self.complete = False
+        self.weight = 1.0
+
+    @property
+    def progress(self):
+        if self.complete:
+            return 1.0
+        if self.job is None:
+            return 0.0
+        return self.job.progress
+
+def parse_events(text):
+    lines = []
+    for line in text.strip().split("\n"):
+        title, sep, depends = line.partition("<-")
+        depends = [d.strip() for d in depends.split(",") if len(d.strip()) > 0]
+        lines.append((title.strip(), depends))
+    return lines
 
 class SequencePlugin(CroniclePlugin):
+    progress_interval = 0
+    poll_interval = 5
+    max_poll_interval = 60
+    has_estimates = False
+
     def execute(self, params):
-        self.api = CronicleAPI(params["api_host"], params["api_key"])
-        self.events = []
-
-        titles = params["events"].strip().split("\n")
-        for title in titles:
-            event = self.api.get_event(title = title)
-            if event.enabled:
-                self.events.append(event)
-            else:
-                raise CronicleError(1, "Event %s is not enabled." % title)
-
-        for i, event in enumerate(self.events):
-            self.run_event(event, i)
-
-    def run_event(self, event, pos):
-        self.log("Starting event '%s'." % event.title)
-
-        queue = event.run()
-        job = queue.wait_for_job()
-        self.log("Job '%s' is running: %s" % (job.id, job.details_url))
-
-        done = Flag()
-        def complete(job):
-            done.set()
-        job.on_complete(complete)
-
-        while not done:
-            self.set_progress((pos + job.progress) / len(self.events))
-
-            count = 0
-            while count < 25 and not done:
-                time.sleep(0.2)
-
-            if not done:
-                job.update_status()
-                if job.complete:
-                    done.set()
-
-        if job.is_failed:
-            result = "%d: %s" % (job.code, job.description)
-            raise CronicleError(3, "Event '%s' failed (%s)" % (event.title, result))
-
-        self.set_progress(float(pos + 1) / len(self.events))
-        self.set_perf(event.title, job.elapsed)
-        self.log("Event '%s' completed successfully." % event.title)
+        self.api = CronicleAPI(params["api_host"], params["api_key"],
+                               cache_file = params.get("event_cache") or None,
+                               cache_ttl = int(params.get("event_cache_ttl") or 300))
+
+        self.history = None
+        if params.get("history_file"):
+            self.history = JobHistory(params["history_file"])
+
+        lines = parse_events(params["events"])
+        self.events = self.api.get_events(titles = [title for (title, depends) in lines])
+        for event in self.events:
+            if not event.enabled:
+                raise CronicleError(1, "Event %s is not enabled." % event.title)
+
+        if params.get("graph"):
+            steps = self.build_graph(lines)
+            concurrency = int(params.get("concurrency") or 0)
+        else:
+            steps = self.build_chain()
+            concurrency = 1
+
+        self.weigh_steps(steps)
+
+        try:
+            self.run_steps(steps, concurrency)
+        finally:
+            self.api.close()
+
+    def build_chain(self):
+        steps = []
+        for event in self.events:
+            steps.append(SequenceStep(event, steps[-1:]))
+        return steps
+
+    def build_graph(self, lines):
+        steps = {}
+        for event, (title, depends) in zip(self.events, lines):
+            if title in steps:
+                raise CronicleError(1, "Event %s appears more than once." % title)
+            steps[title] = SequenceStep(event, [])
+
+        for event, (title, depends) in zip(self.events, lines):
+            for depend in depends:
+                if depend not in steps:
+                    raise CronicleError(1, "Event %s depends on unknown event %s." % (title, depend))
+                steps[title].depends.append(steps[depend])
+
+        # Kahn's algorithm, any step left unvisited is part of a cycle.
+        visited = 0
+        remaining = dict((step, len(step.depends)) for step in steps.values())
+        ready = [step for (step, count) in remaining.items() if count == 0]
+        while len(ready) > 0:
+            step = ready.pop()
+            visited += 1
+            for other in steps.values():
+                if step in other.depends:
+                    remaining[other] -= 1
+                    if remaining[other] == 0:
+                        ready.append(other)
+
+        if visited != len(steps):
+            raise CronicleError(1, "Event dependencies contain a cycle.")
+
+        return [steps[title] for (title, depends) in lines]
+
+    def weigh_steps(self, steps):
+        self.has_estimates = False
+        if self.history is None:
+            return
+
+        # Events with no history are assumed to take the average time of
+        # those that have some.
+        estimates = [self.history.estimate(step.event.id) for step in steps]
+        known = [estimate for estimate in estimates if estimate is not None]
+        self.has_estimates = len(known) > 0
+        default = sum(known) / len(known) if len(known) > 0 else 1.0
+        for step, estimate in zip(steps, estimates):
+            step.weight = max(estimate if estimate is not None else default, 0.001)
+
+    def update_progress(self, steps):
+        total = sum(step.weight for step in steps)
+        self.set_progress(sum(step.weight * step.progress for step in steps) / total)
+
+    def estimate_remaining(self, steps):
+        # The longest chain of remaining work through the dependency graph.
+        finish = {}
+        def finish_time(step):
+            if step not in finish:
+                previous = max([finish_time(depend) for depend in step.depends] or [0])
+                finish[step] = previous + step.weight * (1 - step.progress)
+            return finish[step]
+        return max(finish_time(step) for step in steps)
+
+    def start_step(self, step, events):
+        self.log("Starting event '%s'." % step.event.title)
+        step.queue = step.event.run()
+
+        def started(job):
+            step.job = job
+            events.put(("start", step))
+            if job is not None:
+                job.on_complete(lambda job: events.put(("complete", step)))
+        step.queue.on_job_started(started)
+
+    def poll_steps(self, running):
+        for step in running:
+            if step.job is not None:
+                try:
+                    step.job.check_complete()
+                except CronicleError as e:
+                    self.log("Failed to poll job '%s': %s" % (step.job.id, str(e)))
+
+    def run_steps(self, steps, concurrency):
+        events = Queue()
+        pending = list(steps)
+        running = []
+
+        # Completion is driven by the job_complete web hook. The status poll
+        # only runs when hooks go quiet and backs off the longer they do.
+        ticker = Ticker(lambda: events.put(("poll", None)), self.poll_interval)
+        ticker.start()
+
+        try:
+            while len(pending) > 0 or len(running) > 0:
+                for step in list(pending):
+                    if concurrency > 0 and len(running) >= concurrency:
+                        break
+                    if all(depend.complete for depend in step.depends):
+                        pending.remove(step)
+                        running.append(step)
+                        self.start_step(step, events)
+
+                action, step = events.get()
+                if action == "poll":
+                    self.poll_steps(running)
+                    ticker.interval = min(ticker.interval * 2, self.max_poll_interval)
+                else:
+                    ticker.interval = self.poll_interval
+
+                if action == "start":
+                    if step.job is None:
+                        raise CronicleError(101, "Event %s failed to start." % step.event.title)
+                    self.log("Job '%s' is running: %s" % (step.job.id, step.job.details_url))
+                elif action == "complete":
+                    self.complete_step(step, running)
+                    if self.has_estimates and (len(pending) > 0 or len(running) > 0):
+                        self.log("Estimated time remaining: %d seconds." % self.estimate_remaining(steps))
+
+                self.update_progress(steps)
+        finally:
+            ticker.stop()
+
+    def complete_step(self, step, running):
+        running.remove(step)
+        step.complete = True
+
+        if step.job.is_failed:
+            for other in running:
+                self.log("Event '%s' is still running." % other.event.title)
+            result = "%d: %s" % (step.job.code, step.job.description)
+            raise CronicleError(3, "Event '%s' failed (%s)" % (step.event.title, result))
+
+        self.set_perf(step.event.title, step.job.elapsed)
+        if self.history is not None:
+            self.history.record(step.event.id, step.job.elapsed)
+        self.log("Event '%s' completed successfully." % step.event.title)
 
 if __name__ == "__main__":
     SequencePlugin()
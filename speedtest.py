@@ -1,25 +1,95 @@
 #! /usr/bin/env python
 
 import re
+import time
 from cronicle import CronicleError, CroniclePlugin
 from cronicle.plugin import JsonParser
+from cronicle.perf import percentile
 
 BITS_PER_GB = 8 * 1024 * 1024 * 1024
+BITS_PER_MBIT = 1000 * 1000
+
+def drop_outliers(values, threshold = 3.0):
+    if len(values) < 3:
+        return (values, [])
+
+    # Median absolute deviation is not skewed by the outliers themselves.
+    median = percentile(values, 0.5)
+    deviation = percentile([abs(value - median) for value in values], 0.5)
+    if deviation == 0:
+        return (values, [])
+
+    kept = [value for value in values if abs(value - median) <= threshold * deviation]
+    dropped = [value for value in values if abs(value - median) > threshold * deviation]
+    return (kept, dropped)
+
+def variance(values):
+    mean = sum(values) / len(values)
+    return sum((value - mean) ** 2 for value in values) / len(values)
 
 class SpeedTestPlugin(CroniclePlugin):
-    def execute(self, params):
-        args = [params["speedtest"], "--json"]
-        if not params["upload"]:
+    def run_speedtest(self, speedtest, upload, download):
+        args = [speedtest, "--json"]
+        if not upload:
             args.append("--no-upload")
-        if not params["download"]:
+        if not download:
             args.append("--no-download")
-        json = self.exec_process(args, JsonParser())
+        return self.exec_process(args, JsonParser())
+
+    def take_sample(self, params, samples):
+        directions = [direction for direction in ["upload", "download"] if params[direction]]
+        if params.get("separate"):
+            for direction in directions:
+                json = self.run_speedtest(params["speedtest"], direction == "upload", direction == "download")
+                samples[direction].append(json[direction])
+        else:
+            json = self.run_speedtest(params["speedtest"], params["upload"], params["download"])
+            for direction in directions:
+                samples[direction].append(json[direction])
+
+    def execute(self, params):
+        count = int(params.get("samples") or 1)
+        spacing = float(params.get("spacing") or 0)
+
+        samples = { "upload": [], "download": [] }
+        for i in range(count):
+            if i > 0 and spacing > 0:
+                time.sleep(spacing)
+            self.take_sample(params, samples)
+            self.set_progress(float(i + 1) / count)
+
+        rows = []
+        for direction in ["upload", "download"]:
+            if not params[direction]:
+                continue
+
+            kept, dropped = drop_outliers(samples[direction])
+            self.set_perf(direction, BITS_PER_GB / percentile(kept, 0.5))
+            if count == 1:
+                continue
+
+            # Cronicle adds perf values up as parts of the job's time, so the
+            # spread goes in counts as rates instead.
+            self.set_count("%s_p90_mbps" % direction, round(percentile(kept, 0.1) / BITS_PER_MBIT, 2))
+            self.set_count("%s_min_mbps" % direction, round(min(kept) / BITS_PER_MBIT, 2))
+            self.set_count("%s_max_mbps" % direction, round(max(kept) / BITS_PER_MBIT, 2))
+            self.set_count("%s_variance_mbps2" % direction, round(variance(kept) / BITS_PER_MBIT ** 2, 2))
+            self.set_count("%s_outliers" % direction, len(dropped))
 
-        if params["upload"]:
-            self.set_perf("upload", BITS_PER_GB / json["upload"])
+            rows.append([direction.capitalize(),
+                         "%.2f" % (percentile(kept, 0.5) / BITS_PER_MBIT),
+                         "%.2f" % (percentile(kept, 0.1) / BITS_PER_MBIT),
+                         "%.2f" % (min(kept) / BITS_PER_MBIT),
+                         "%.2f" % (max(kept) / BITS_PER_MBIT),
+                         "%.2f" % (variance(kept) / BITS_PER_MBIT ** 2),
+                         len(kept),
+                         len(dropped)])
 
-        if params["download"]:
-            self.set_perf("download", BITS_PER_GB / json["download"])
+        if len(rows) > 0:
+            self.log_table("Speed test (Mbit/s)",
+                           ["Direction", "Median", "P90", "Min", "Max", "Variance", "Samples", "Outliers"],
+                           rows,
+                           "P90 is the rate 90% of samples reached or beat.")
 
 if __name__ == "__main__":
     SpeedTestPlugin()
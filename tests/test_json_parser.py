@@ -0,0 +1,35 @@
+import os
+import sys
+import json
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cronicle import CronicleError
+from cronicle.plugin import JsonParser
+
+def parse(text):
+    parser = JsonParser()
+    for line in text.split("\n"):
+        parser.parse_line(line)
+    return parser.process_complete(0)
+
+class JsonParserTest(unittest.TestCase):
+    def test_unicode_escape(self):
+        value = { "server": { "sponsor": u"Orange S\xe1" }, "upload": 1.0 }
+        self.assertEqual(parse(json.dumps(value, indent=2)), value)
+
+    def test_odd_escapes(self):
+        for text in [u"x\ny", u"\xe1\xe9\xed", u"a\\", u'q"\\"', u"t\tz\\\\"]:
+            value = { "name": text, "nested": [{ "name": text }] }
+            self.assertEqual(parse(json.dumps(value, indent=2)), value)
+            self.assertEqual(parse(json.dumps(value)), value)
+
+    def test_multiple_values(self):
+        self.assertEqual(parse('{"a": "\\u00e1"}\n{"b": [1, 2]}'), [{ "a": u"\xe1" }, { "b": [1, 2] }])
+
+    def test_invalid(self):
+        self.assertRaises(CronicleError, parse, '{"a": ')
+
+if __name__ == "__main__":
+    unittest.main()